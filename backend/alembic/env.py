@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from logging.config import fileConfig
 from typing import Any, cast
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import Connection, make_url
 
 from app.db import Base
 
@@ -32,6 +34,37 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+# Drivers that must go through SQLAlchemy's asyncio engine
+ASYNC_DRIVERS = {"asyncpg", "aiosqlite"}
+
+
+def _is_async_url(url: str | None) -> bool:
+    if not url:
+        return False
+    try:
+        return make_url(url).get_driver_name() in ASYNC_DRIVERS
+    except Exception:
+        return False
+
+
+def _do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def _run_async_migrations(options: dict[str, Any]) -> None:
+    from sqlalchemy.ext.asyncio import async_engine_from_config
+
+    connectable = async_engine_from_config(options, prefix="sqlalchemy.", poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(_do_run_migrations)
+
+    await connectable.dispose()
+
+
 def run_migrations_online() -> None:
     config_section = config.config_ini_section
     if config_section is None:
@@ -42,6 +75,10 @@ def run_migrations_online() -> None:
         raise RuntimeError(f"Missing config section: {config_section}")
 
     options = dict(section)
+    if _is_async_url(options.get("sqlalchemy.url")):
+        asyncio.run(_run_async_migrations(cast(dict[str, Any], options)))
+        return
+
     connectable = engine_from_config(
         cast(dict[str, Any], options),
         prefix="sqlalchemy.",
@@ -49,10 +86,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+        _do_run_migrations(connection)
 
 
 if context.is_offline_mode():
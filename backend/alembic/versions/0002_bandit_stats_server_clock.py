@@ -0,0 +1,38 @@
+"""bandit_stats server-side timestamps
+
+Revision ID: 0002_bandit_stats_server_clock
+Revises: 0001_baseline
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_bandit_stats_server_clock"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    # Tables are created by init_db(); only alter when present
+    if not _has_table("bandit_stats"):
+        return
+    with op.batch_alter_table("bandit_stats") as batch:
+        batch.alter_column("first_seen_at", existing_type=sa.DateTime(timezone=True), existing_nullable=False, server_default=sa.func.now())
+        batch.alter_column("updated_at", existing_type=sa.DateTime(timezone=True), existing_nullable=False, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    if not _has_table("bandit_stats"):
+        return
+    with op.batch_alter_table("bandit_stats") as batch:
+        batch.alter_column("first_seen_at", existing_type=sa.DateTime(timezone=True), existing_nullable=False, server_default=None)
+        batch.alter_column("updated_at", existing_type=sa.DateTime(timezone=True), existing_nullable=False, server_default=None)
@@ -0,0 +1,63 @@
+"""decisions/feedback native JSON columns
+
+Revision ID: 0003_json_columns
+Revises: 0002_bandit_stats_server_clock
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = "0003_json_columns"
+down_revision = "0002_bandit_stats_server_clock"
+branch_labels = None
+depends_on = None
+
+_JSON_COLUMNS = {
+    "decisions": ("context", "hparams", "operators"),
+    "feedback": ("components", "safety_flags"),
+}
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    # SQLite keeps JSON as text, so rows written by json.dumps are already valid; only
+    # PostgreSQL needs the stored strings parsed into JSONB.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, columns in _JSON_COLUMNS.items():
+        if not _has_table(table):
+            continue
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.Text(),
+                existing_nullable=False,
+                type_=JSONB(),
+                postgresql_using=f"{column}::jsonb",
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, columns in _JSON_COLUMNS.items():
+        if not _has_table(table):
+            continue
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                existing_type=JSONB(),
+                existing_nullable=False,
+                type_=sa.Text(),
+                postgresql_using=f"{column}::text",
+            )
@@ -0,0 +1,39 @@
+"""decisions (assistant, category, recipe_id) index
+
+Revision ID: 0004_decisions_group_index
+Revises: 0003_json_columns
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_decisions_group_index"
+down_revision = "0003_json_columns"
+branch_labels = None
+depends_on = None
+
+_INDEX = "ix_decisions_group_recipe"
+
+
+def _index_names(table: str) -> set[str] | None:
+    insp = sa.inspect(op.get_bind())
+    if not insp.has_table(table):
+        return None
+    return {ix["name"] for ix in insp.get_indexes(table) if ix["name"]}
+
+
+def upgrade() -> None:
+    # A missing table is created later by init_db(), index included
+    names = _index_names("decisions")
+    if names is not None and _INDEX not in names:
+        op.create_index(_INDEX, "decisions", ["assistant", "category", "recipe_id"])
+
+
+def downgrade() -> None:
+    names = _index_names("decisions")
+    if names is not None and _INDEX in names:
+        op.drop_index(_INDEX, table_name="decisions")
@@ -7,18 +7,21 @@ for an ε-greedy policy. The selector supports:
 * an optimistic initial value for unseen recipes
 * random tie-breaking for equal averages
 * accounting of explore vs exploit selections
-* a small in-process TTL cache for stats
+* a small process-wide TTL cache for stats, shared across service instances
 * Prometheus metrics for selection and feedback latency
 """
 from __future__ import annotations
 import random
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, UTC
 import logging
+import threading
 import time
 
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from .db import BanditStats
 from .recipes import RecipeModel
@@ -27,6 +30,47 @@ from . import metrics
 
 logger = logging.getLogger(__name__)
 
+# recipe_id -> (sample_count, mean reward or None when unsampled), derived once from BanditStats
+ArmTable = Dict[str, Tuple[float, Optional[float]]]
+
+# Process-wide arm cache shared by every BanditService instance:
+# (assistant, category) -> (arm table, expires_at monotonic seconds)
+_STATS_CACHE: Dict[Tuple[str, str], Tuple[ArmTable, float]] = {}
+_STATS_CACHE_MAXSIZE = 1024
+_STATS_LOCK = threading.RLock()
+
+
+def _stats_cache_get(key: Tuple[str, str], now: float) -> Optional[ArmTable]:
+    with _STATS_LOCK:
+        cached = _STATS_CACHE.get(key)
+        if cached is None:
+            return None
+        if cached[1] <= now:
+            del _STATS_CACHE[key]
+            return None
+        return cached[0]
+
+
+def _stats_cache_put(key: Tuple[str, str], arms: ArmTable, expires_at: float) -> None:
+    with _STATS_LOCK:
+        if key not in _STATS_CACHE and len(_STATS_CACHE) >= _STATS_CACHE_MAXSIZE:
+            now = time.monotonic()
+            for k in [k for k, (_, exp) in _STATS_CACHE.items() if exp <= now]:
+                del _STATS_CACHE[k]
+            if len(_STATS_CACHE) >= _STATS_CACHE_MAXSIZE:
+                # Evict the oldest insertion
+                del _STATS_CACHE[next(iter(_STATS_CACHE))]
+        _STATS_CACHE[key] = (arms, expires_at)
+
+
+def invalidate_stats_cache(assistant: str, category: str) -> None:
+    with _STATS_LOCK:
+        _STATS_CACHE.pop((assistant, category), None)
+
+
+# Bound parameters per statement on SQLite builds before 3.32; multi-row upserts are sized to fit
+_SQLITE_MAX_VARIABLES = 999
+
 
 @dataclass
 class BanditConfig:
@@ -36,69 +80,119 @@ class BanditConfig:
 
 class BanditStatsRepository:
     def get_group_stats(self, db: Session, assistant: str, category: str) -> Dict[str, Dict[str, float]]:
-        rows = (
-            db.query(BanditStats)
-            .filter(BanditStats.assistant == assistant, BanditStats.category == category)
-            .all()
-        )
+        # Core select: plain tuples, no ORM hydration or identity-map tracking
+        t = BanditStats.__table__
+        stmt = select(
+            t.c.recipe_id, t.c.sample_count, t.c.reward_sum, t.c.explore_count, t.c.exploit_count
+        ).where(t.c.assistant == assistant, t.c.category == category)
         stats: Dict[str, Dict[str, float]] = {}
-        for r in rows:
-            stats[r.recipe_id] = {
-                "sample_count": float(r.sample_count or 0),
-                "reward_sum": float(r.reward_sum or 0.0),
-                "explore_count": float(r.explore_count or 0),
-                "exploit_count": float(r.exploit_count or 0),
+        for recipe_id, sample_count, reward_sum, explore_count, exploit_count in db.execute(stmt).all():
+            stats[recipe_id] = {
+                "sample_count": float(sample_count or 0),
+                "reward_sum": float(reward_sum or 0.0),
+                "explore_count": float(explore_count or 0),
+                "exploit_count": float(exploit_count or 0),
             }
         return stats
 
-    def _get_or_create(self, db: Session, assistant: str, category: str, recipe_id: str) -> BanditStats:
-        row = (
-            db.query(BanditStats)
-            .filter(
-                BanditStats.assistant == assistant,
-                BanditStats.category == category,
-                BanditStats.recipe_id == recipe_id,
+    def _bump(self, db: Session, assistant: str, category: str, recipe_id: str, deltas: Dict[str, float]) -> None:
+        """Add ``deltas`` to the counters of one row, creating it on first sight.
+
+        SQLite and PostgreSQL get a single ``INSERT ... ON CONFLICT DO UPDATE``
+        against the (assistant, category, recipe_id) unique constraint; other
+        dialects issue a Core ``UPDATE`` and only ``INSERT`` when it matched no row.
+        """
+        t = BanditStats.__table__
+        set_ = {col: t.c[col] + delta for col, delta in deltas.items()}
+        # Neither ON CONFLICT's SET clause nor Core update() applies Column.onupdate
+        set_["updated_at"] = func.now()
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            values = {
+                "assistant": assistant,
+                "category": category,
+                "recipe_id": recipe_id,
+                "sample_count": 0,
+                "reward_sum": 0.0,
+                "explore_count": 0,
+                "exploit_count": 0,
+                "first_seen_at": func.now(),
+                "updated_at": func.now(),
+            }
+            values.update(deltas)
+            insert_fn = sqlite_insert if dialect == "sqlite" else pg_insert
+            stmt = insert_fn(t).values(**values).on_conflict_do_update(
+                index_elements=["assistant", "category", "recipe_id"],
+                set_=set_,
             )
-            .first()
+            db.execute(stmt)
+            return
+        result = db.execute(
+            update(t)
+            .where(t.c.assistant == assistant, t.c.category == category, t.c.recipe_id == recipe_id)
+            .values(**set_)
         )
-        if row is None:
-            row = BanditStats(
-                assistant=assistant,
-                category=category,
-                recipe_id=recipe_id,
-                sample_count=0,
-                reward_sum=0.0,
-                explore_count=0,
-                exploit_count=0,
-                first_seen_at=datetime.now(UTC),
-                updated_at=datetime.now(UTC),
-            )
-            db.add(row)
-        return row
+        if result.rowcount == 0:
+            values = {"sample_count": 0, "reward_sum": 0.0, "explore_count": 0, "exploit_count": 0}
+            values.update(deltas)
+            db.execute(insert(t).values(assistant=assistant, category=category, recipe_id=recipe_id, **values))
 
     def increment_selection(self, db: Session, assistant: str, category: str, recipe_id: str, explored: bool) -> None:
-        row = self._get_or_create(db, assistant, category, recipe_id)
-        if explored:
-            row.explore_count = int(row.explore_count or 0) + 1
-        else:
-            row.exploit_count = int(row.exploit_count or 0) + 1
-        row.updated_at = datetime.now(UTC)
+        self._bump(db, assistant, category, recipe_id, {"explore_count": 1} if explored else {"exploit_count": 1})
 
     def upsert_feedback(self, db: Session, assistant: str, category: str, recipe_id: str, reward: float) -> None:
-        row = self._get_or_create(db, assistant, category, recipe_id)
-        row.sample_count = int(row.sample_count or 0) + 1
-        row.reward_sum = float(row.reward_sum or 0.0) + float(reward)
-        row.updated_at = datetime.now(UTC)
+        self._bump(db, assistant, category, recipe_id, {"sample_count": 1, "reward_sum": float(reward)})
+
+    def set_feedback_totals(self, db: Session, rows: List[Dict[str, object]]) -> None:
+        """Overwrite sample_count/reward_sum for many groups, creating missing rows.
+
+        Each row carries assistant, category, recipe_id, sample_count and reward_sum.
+        SQLite and PostgreSQL get one multi-row ``INSERT ... ON CONFLICT DO UPDATE``;
+        other dialects fall back to an ``UPDATE`` then ``INSERT`` per row.
+        """
+        if not rows:
+            return
+        t = BanditStats.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert_fn = sqlite_insert if dialect == "sqlite" else pg_insert
+            values = [{**row, "explore_count": 0, "exploit_count": 0} for row in rows]
+            # Every literal binds one parameter (func.now() renders inline), so size chunks by row width
+            chunk = max(1, _SQLITE_MAX_VARIABLES // len(values[0]))
+            for start in range(0, len(values), chunk):
+                stmt = insert_fn(t).values(
+                    [
+                        {**value, "first_seen_at": func.now(), "updated_at": func.now()}
+                        for value in values[start : start + chunk]
+                    ]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["assistant", "category", "recipe_id"],
+                    set_={
+                        "sample_count": stmt.excluded.sample_count,
+                        "reward_sum": stmt.excluded.reward_sum,
+                        "updated_at": func.now(),
+                    },
+                )
+                db.execute(stmt)
+            return
+        for row in rows:
+            result = db.execute(
+                update(t)
+                .where(t.c.assistant == row["assistant"], t.c.category == row["category"], t.c.recipe_id == row["recipe_id"])
+                .values(sample_count=row["sample_count"], reward_sum=row["reward_sum"], updated_at=func.now())
+            )
+            if result.rowcount == 0:
+                db.execute(insert(t).values(explore_count=0, exploit_count=0, **row))
 
 
-def _average_for(recipe_id: str, stats: Dict[str, Dict[str, float]], optimistic: float) -> float:
-    s = stats.get(recipe_id)
-    if not s:
-        return float(optimistic)
-    cnt = float(s.get("sample_count", 0.0))
-    if cnt <= 0:
-        return float(optimistic)
-    return float(s.get("reward_sum", 0.0)) / cnt
+def arm_table(stats: Dict[str, Dict[str, float]]) -> ArmTable:
+    """Reduce per-recipe counters to (sample_count, mean) pairs for selection."""
+    arms: ArmTable = {}
+    for recipe_id, s in stats.items():
+        cnt = float(s.get("sample_count", 0.0))
+        arms[recipe_id] = (cnt, float(s.get("reward_sum", 0.0)) / cnt if cnt > 0 else None)
+    return arms
 
 
 def epsilon_greedy_select(
@@ -109,12 +203,41 @@ def epsilon_greedy_select(
     rng: Optional[random.Random] = None,
 ) -> Tuple[RecipeModel, float, str, bool]:
     """Return (recipe, propensity, policy, explored_flag)."""
+    return select_from_arms(candidates, arm_table(stats), epsilon, config, rng=rng)
+
+
+def select_from_arms(
+    candidates: List[RecipeModel],
+    arms: ArmTable,
+    epsilon: float,
+    config: BanditConfig,
+    rng: Optional[random.Random] = None,
+) -> Tuple[RecipeModel, float, str, bool]:
+    """:func:`epsilon_greedy_select` over a precomputed :func:`arm_table`."""
     if not candidates:
         raise ValueError("No candidate recipes available")
     rng = rng or random
 
+    # Single pass: collect under-sampled arms and the exploit argmax set together
+    min_samples = config.min_initial_samples
+    optimistic = float(config.optimistic_initial_value)
+    unsampled = (0.0, None)
+    under: List[RecipeModel] = []
+    best: List[RecipeModel] = []
+    best_score = float("-inf")
+    get_arm = arms.get
+    for r in candidates:
+        cnt, mean = get_arm(r.id, unsampled)
+        if cnt < min_samples:
+            under.append(r)
+        score = optimistic if mean is None else mean
+        if score > best_score + 1e-12:
+            best_score = score
+            best = [r]
+        elif abs(score - best_score) <= 1e-12:
+            best.append(r)
+
     # Cold start
-    under = [r for r in candidates if float(stats.get(r.id, {}).get("sample_count", 0.0)) < config.min_initial_samples]
     if under:
         choice = rng.choice(under)
         return choice, 1.0, "coldstart", True
@@ -125,16 +248,7 @@ def epsilon_greedy_select(
         return choice, float(epsilon), "explore", True
 
     # Exploitation with random tie-break
-    best_score = None
-    best: List[RecipeModel] = []
-    for r in candidates:
-        score = _average_for(r.id, stats, config.optimistic_initial_value)
-        if best_score is None or score > best_score + 1e-12:
-            best_score = score
-            best = [r]
-        elif abs(score - (best_score or 0.0)) <= 1e-12:
-            best.append(r)
-    choice = rng.choice(best) if best else rng.choice(candidates)
+    choice = rng.choice(best)
     return choice, float(1.0 - float(epsilon)), "exploit", False
 
 
@@ -142,7 +256,8 @@ class BanditService:
     def __init__(self, config: BanditConfig, cache_ttl_seconds: int = 5):
         self.config = config
         self.repo = BanditStatsRepository()
-        self._stats_cache: dict[tuple[str, str], tuple[Dict[str, Dict[str, float]], float]] = {}
+        # Dedicated generator: avoids contention on the module-level random state
+        self._rng = random.Random()
         self._cache_ttl = float(cache_ttl_seconds)
 
     def select_recipe(
@@ -156,18 +271,16 @@ class BanditService:
         eligible = _eligible(candidates, db)
         if not eligible:
             eligible = candidates
-        # Stats with small TTL cache
+        # Arm means with small process-wide TTL cache; computed once per refill, not per request
         key = (assistant, category)
         now = time.monotonic()
-        cached = self._stats_cache.get(key)
-        if cached and cached[1] > now:
-            stats = cached[0]
-        else:
-            stats = self.repo.get_group_stats(db, assistant, category)
-            self._stats_cache[key] = (stats, now + self._cache_ttl)
+        arms = _stats_cache_get(key, now)
+        if arms is None:
+            arms = arm_table(self.repo.get_group_stats(db, assistant, category))
+            _stats_cache_put(key, arms, now + self._cache_ttl)
         t0 = time.monotonic()
-        recipe, propensity, policy, explored = epsilon_greedy_select(
-            eligible, stats, epsilon, self.config
+        recipe, propensity, policy, explored = select_from_arms(
+            eligible, arms, epsilon, self.config, rng=self._rng
         )
         metrics.BANDIT_SELECTION_LATENCY.observe(time.monotonic() - t0)
         # Count selection
@@ -199,7 +312,7 @@ class BanditService:
         t0 = time.monotonic()
         self.repo.upsert_feedback(db, assistant, category, recipe_id, reward)
         # Invalidate cache for this group
-        self._stats_cache.pop((assistant, category), None)
+        invalidate_stats_cache(assistant, category)
         metrics.BANDIT_FEEDBACK_LATENCY.observe(time.monotonic() - t0)
         try:
             logger.info(
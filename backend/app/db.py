@@ -1,64 +1,142 @@
 """SQLAlchemy models and database initialization."""
 import os
 import json
+import sqlite3
+import time
+import uuid
 from datetime import datetime, UTC
-from typing import Dict, Any
-from sqlalchemy import create_engine, Column, String, DateTime, Float, Text, Integer, ForeignKey, UniqueConstraint, Index
+from typing import Any
+from sqlalchemy import create_engine, event, func, Column, String, DateTime, Float, Text, Integer, ForeignKey, UniqueConstraint, Index, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session, relationship, declarative_base
+from sqlalchemy.pool import StaticPool
+
+try:  # orjson is optional; fall back to the stdlib encoder
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> str:
+    # SQLAlchemy expects the serializer to return str
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./console.sqlite")
-engine = create_engine(DATABASE_URL, echo=False)
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# Connections are reused across requests; size the pool for the threadpool's concurrency
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+_POOL_KWARGS = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+if _IS_SQLITE:
+    # Sessions are handed across FastAPI's threadpool and the decision writer thread. An in-memory
+    # database exists per connection, so it gets one shared connection (StaticPool) rather than the
+    # default one-per-thread pool, which would leave other threads on empty databases; file
+    # databases get a QueuePool
+    _in_memory = make_url(DATABASE_URL).database in (None, "", ":memory:")
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        json_serializer=_json_dumps,
+        json_deserializer=_json_loads,
+        **({"poolclass": StaticPool} if _in_memory else _POOL_KWARGS),
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_pre_ping=True,
+        json_serializer=_json_dumps,
+        json_deserializer=_json_loads,
+        **_POOL_KWARGS,
+    )
+
+# WAL lets readers proceed alongside the single writer; NORMAL syncs once per checkpoint instead of per commit
+_SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+if _SQLITE_SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    _SQLITE_SYNCHRONOUS = "NORMAL"
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    f"PRAGMA synchronous={_SQLITE_SYNCHRONOUS}",
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))}",
+    f"PRAGMA cache_size={int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))}",
+)
+
+
+if _IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# SQLite gained window functions in 3.25; other supported backends always have them
+WINDOW_FUNCTIONS = not _IS_SQLITE or sqlite3.sqlite_version_info >= (3, 25, 0)
 Base = declarative_base()
 
+# JSONB on PostgreSQL (parsed binary form, indexable); JSON text elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 _DB_INITIALIZED = False
 
 
+def new_decision_id() -> str:
+    """Return a UUIDv7 (RFC 9562) string: 48-bit Unix milliseconds, then random bits.
+
+    Ids sort by creation time, so inserts append to the primary-key index instead of
+    landing on random pages; the text form is a standard dashed UUID.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 64) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # RFC variant
+    value |= rand & 0x3FFFFFFFFFFFFFFF  # rand_b
+    return str(uuid.UUID(int=value))
+
+
 class Decision(Base):
     """Stores prompt engineering decisions."""
     __tablename__ = "decisions"
 
+    __table_args__ = (
+        # Covers the /stats GROUP BY so the decision side of the join is read from the index
+        Index("ix_decisions_group_recipe", "assistant", "category", "recipe_id"),
+    )
+
     id = Column(String, primary_key=True)
     ts = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
     assistant = Column(String, nullable=False, index=True)
     category = Column(String, nullable=False, index=True)
-    context = Column(Text, nullable=False)  # JSON string
+    context = Column(JSONType, nullable=False)
     recipe_id = Column(String, nullable=False, index=True)
-    hparams = Column(Text, nullable=False)  # JSON string
+    hparams = Column(JSONType, nullable=False)
     propensity = Column(Float, nullable=False)
     raw_input = Column(Text, nullable=True)  # Optional for privacy
     engineered_prompt = Column(Text, nullable=True)  # Optional for privacy
-    operators = Column(Text, nullable=False)  # JSON list of applied operators
+    operators = Column(JSONType, nullable=False)  # list of applied operators
 
     # Relationship
     feedback_record = relationship("Feedback", back_populates="decision", uselist=False)
 
-    def get_context_dict(self) -> Dict[str, Any]:
-        """Parse context JSON string."""
-        return json.loads(self.context) if self.context else {}
-
-    def set_context_dict(self, context_dict: Dict[str, Any]):
-        """Set context from dictionary."""
-        self.context = json.dumps(context_dict)
-
-    def get_hparams_dict(self) -> Dict[str, Any]:
-        """Parse hyperparameters JSON string."""
-        return json.loads(self.hparams) if self.hparams else {}
-
-    def set_hparams_dict(self, hparams_dict: Dict[str, Any]):
-        """Set hyperparameters from dictionary."""
-        self.hparams = json.dumps(hparams_dict)
-
-    def get_operators_list(self) -> list:
-        """Parse operators JSON list."""
-        return json.loads(self.operators) if self.operators else []
-
-    def set_operators_list(self, operators_list: list):
-        """Set operators from list."""
-        self.operators = json.dumps(operators_list)
-
 
 class Feedback(Base):
     """Stores feedback for decisions."""
@@ -67,27 +145,12 @@ class Feedback(Base):
     decision_id = Column(String, ForeignKey("decisions.id"), primary_key=True)
     ts = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
     reward = Column(Float, nullable=False)
-    components = Column(Text, nullable=False)  # JSON string of reward components
-    safety_flags = Column(Text, nullable=False)  # JSON list of safety flags
+    components = Column(JSONType, nullable=False)  # reward components
+    safety_flags = Column(JSONType, nullable=False)  # list of safety flags
 
     # Relationship
     decision = relationship("Decision", back_populates="feedback_record")
 
-    def get_components_dict(self) -> Dict[str, float]:
-        """Parse components JSON string."""
-        return json.loads(self.components) if self.components else {}
-
-    def set_components_dict(self, components_dict: Dict[str, float]):
-        """Set components from dictionary."""
-        self.components = json.dumps(components_dict)
-
-    def get_safety_flags_list(self) -> list:
-        """Parse safety flags JSON list."""
-        return json.loads(self.safety_flags) if self.safety_flags else []
-
-    def set_safety_flags_list(self, flags_list: list):
-        """Set safety flags from list."""
-        self.safety_flags = json.dumps(flags_list)
 
 
 class BanditStats(Base):
@@ -110,8 +173,9 @@ class BanditStats(Base):
     explore_count = Column(Integer, nullable=False, default=0)
     exploit_count = Column(Integer, nullable=False, default=0)
 
-    first_seen_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    # Clock read happens in the database; `default` keeps inserts valid on tables created before server_default
+    first_seen_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
 # Simple helper to enforce uniqueness via (assistant, category, recipe_id)
@@ -123,7 +187,11 @@ def get_db() -> Session:
     init_db()
     db = SessionLocal()
     try:
+        # The session opens one transaction on first use and keeps it until commit/close
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -0,0 +1,158 @@
+"""Background writer that batches Decision inserts into a single commit."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .db import SessionLocal, Decision
+
+logger = logging.getLogger(__name__)
+
+# Queued after the last row by close(); tells the writer thread to exit
+_STOP: dict[str, Any] = {}
+
+
+class DecisionWriter:
+    """Single consumer thread that drains queued Decision rows and commits them together.
+
+    Callers enqueue plain dicts with ``submit``; the writer blocks for the first row, then
+    gathers up to ``batch_max`` rows (or whatever arrives within ``batch_ms``) and writes
+    them with one multi-row INSERT and one commit. ``flush`` waits until everything queued
+    so far has been committed, for readers that must see their own decisions; ``close``
+    flushes and stops the thread on shutdown.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_max: int = 64,
+        batch_ms: float = 5.0,
+        max_retries: int = 3,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_max = max(1, int(batch_max))
+        self._batch_s = max(0.0, float(batch_ms)) / 1000.0
+        self._max_retries = max(1, int(max_retries))
+        self._queue: "queue.Queue[dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Sequence counters: rows handed to submit vs rows the writer has finished with
+        self._done = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+
+    def submit(self, values: dict[str, Any]) -> None:
+        self._ensure_started()
+        with self._done:
+            self._submitted += 1
+            self._queue.put(values)
+
+    def flush(self) -> None:
+        """Block until every row submitted so far has been written (or dropped after retries).
+
+        Only waits for the rows queued before the call; rows submitted afterwards do not
+        extend the wait, so readers are not starved by steady /choose traffic.
+        """
+        if self._thread is None:
+            return
+        with self._done:
+            watermark = self._submitted
+            self._done.wait_for(lambda: self._written >= watermark)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush pending rows, then stop the writer thread. A later submit restarts it."""
+        thread = self._thread
+        if thread is None:
+            return
+        self.flush()
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        with self._start_lock:
+            if self._thread is thread and not thread.is_alive():
+                self._thread = None
+        if not self._queue.empty():
+            # A submit raced the stop marker; hand its rows to a fresh thread
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="decision-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> tuple[list[dict[str, Any]], bool]:
+        """Collect the next batch; the flag is True once the stop marker has been seen."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        rows = [first]
+        deadline = time.monotonic() + self._batch_s
+        while len(rows) < self._batch_max:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    row = self._queue.get(timeout=remaining)
+                else:
+                    row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is _STOP:
+                return rows, True
+            rows.append(row)
+        return rows, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            rows, stopping = self._drain()
+            if not rows:
+                continue
+            try:
+                self._write(rows)
+            except Exception as e:
+                logger.exception(
+                    "decision_batch_write_failed dropped=%d ids=%s: %s",
+                    len(rows),
+                    [r.get("id") for r in rows],
+                    e,
+                )
+            finally:
+                with self._done:
+                    self._written += len(rows)
+                    self._done.notify_all()
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        # Rows may carry different optional columns (raw text only when stored); group so
+        # each executemany shares one column set
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for attempt in range(1, self._max_retries + 1):
+            session = self._session_factory()
+            try:
+                for group in groups.values():
+                    session.execute(insert(Decision), group)
+                session.commit()
+                return
+            except OperationalError as e:
+                # SQLite reports a busy/locked database as OperationalError; back off and retry
+                session.rollback()
+                if attempt >= self._max_retries:
+                    raise
+                logger.warning("decision_batch_retry attempt=%d rows=%d: %s", attempt, len(rows), e)
+                time.sleep(0.01 * attempt)
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
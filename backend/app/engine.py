@@ -1,7 +1,9 @@
 """Deterministic prompt engineering operators and prompt builder."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Callable, Dict, Iterable, List, Mapping, MutableMapping, Sequence, Tuple
 
 __all__ = [
@@ -29,21 +31,27 @@ class OperatorContext:
 OperatorBuilder = Callable[[OperatorContext], str | None]
 
 
+# Builders are pure functions of small argument domains (category, a bool, the recipe's
+# examples); memoize them so repeated requests reuse the assembled strings.
+@lru_cache(maxsize=64)
 def op_role_hdr(category: str) -> str:
     return f"You are an expert in {category}. Provide precise, correct, concise answers."
 
 
+_CONSTRAINT_LINES: Tuple[str, ...] = (
+    "No hidden chain-of-thought.",
+    "Prefer stepwise explanations for non-trivial tasks.",
+    "Cite sources if making factual claims.",
+)
+_CONSTRAINTS_DEFAULT = "\n".join(_CONSTRAINT_LINES)
+_CONSTRAINTS_CODING = "\n".join(_CONSTRAINT_LINES + ("If coding, include runnable examples when feasible.",))
+
+
 def op_constraints(category: str) -> str:
-    lines = [
-        "No hidden chain-of-thought.",
-        "Prefer stepwise explanations for non-trivial tasks.",
-        "Cite sources if making factual claims.",
-    ]
-    if category == "coding":
-        lines.append("If coding, include runnable examples when feasible.")
-    return "\n".join(lines)
+    return _CONSTRAINTS_CODING if category == "coding" else _CONSTRAINTS_DEFAULT
 
 
+@lru_cache(maxsize=2)
 def op_io_format(force_json: bool) -> str:
     if force_json:
         return (
@@ -59,10 +67,16 @@ def op_io_format(force_json: bool) -> str:
 def op_examples(examples: Sequence[str]) -> str:
     if not examples:
         return ""
+    return _examples_block(tuple(examples))
+
+
+@lru_cache(maxsize=256)
+def _examples_block(examples: Tuple[str, ...]) -> str:
     header = "Examples:"
     return header + "\n\n" + "\n\n".join(examples)
 
 
+@lru_cache(maxsize=1)
 def op_quality_bar() -> str:
     return (
         "Answer must be correct, complete, and minimal; address edge cases when relevant."
@@ -112,7 +126,8 @@ def register_operator(
         raise ValueError("Operator name must be a non-empty string")
     if not overwrite and name in registry:
         raise ValueError(f"Operator '{name}' is already registered")
-    registry[name] = builder
+    # Interned keys let lookups with the same (interned) name short-circuit on identity
+    registry[sys.intern(name)] = builder
 
 
 def build_prompt(
@@ -134,7 +149,8 @@ def build_prompt(
     context = OperatorContext(
         category=category,
         force_json=force_json,
-        examples=tuple(examples or ()),
+        # Callers usually already hold a tuple (e.g. from the recipe); don't copy it again
+        examples=examples if type(examples) is tuple else tuple(examples or ()),
     )
 
     for op in operators:
@@ -145,12 +161,14 @@ def build_prompt(
         block = builder(context)
         if not block:
             continue
-        blocks.append(block)
+        # Whitespace-only blocks still count as applied but add nothing to the prompt
+        if not block.isspace():
+            blocks.append(block)
         applied.append(op)
 
     # Raw task at the end
-    blocks.append("TASK:\n" + raw_input.strip())
+    blocks.append(f"TASK:\n{raw_input.strip()}")
 
-    prompt = "\n\n".join([b for b in blocks if b.strip()])
-    return prompt, applied
+    # Every block is non-blank by construction, so join without a filtering pass
+    return "\n\n".join(blocks), applied
 
@@ -4,6 +4,7 @@ The enhancer rewrites the user's raw input for clarity without changing intent.
 from __future__ import annotations
 import json
 import os
+import threading
 from typing import Optional
 
 try:
@@ -11,6 +12,16 @@ try:
 except Exception:  # transformers/torch may be optional
     pipeline = None
 
+try:  # orjson is optional; fall back to the stdlib codec
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import httpx
+except Exception:  # fall back to urllib when httpx is unavailable
+    httpx = None  # type: ignore
+
 try:
     import urllib.request
 except Exception:
@@ -19,6 +30,46 @@ except Exception:
 from .guardrails import sanitize_text
 
 
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _get_http_client():
+    """Shared keep-alive client so hosted calls reuse TCP/TLS connections."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None and httpx is not None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = httpx.Client(
+                    timeout=15,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+                )
+    return _HTTP_CLIENT
+
+
+def _parse_hosted_body(body: str) -> str:
+    try:
+        data = _loads(body)
+        # accept either {"text": "..."} or raw string
+        if isinstance(data, dict) and "text" in data:
+            return str(data["text"]).strip()
+        return str(data).strip()
+    except Exception:
+        return body.strip()
+
+
 class Enhancer:
     """Configurable enhancer with three modes: hosted, local, or fallback.
 
@@ -32,40 +83,48 @@ class Enhancer:
     def __init__(self, model_name: Optional[str] = None) -> None:
         self.model_name = model_name or os.getenv("ENHANCER_MODEL", "google/flan-t5-base")
         self._pipe = None
+        # One instance is shared across request threads; build the pipeline only once
+        self._pipe_lock = threading.Lock()
         self.last_mode: str = "fallback"
 
     def _ensure_pipe(self):
         if self._pipe is None and pipeline is not None:
-            try:
-                self._pipe = pipeline("text2text-generation", model=self.model_name)
-            except Exception:
-                self._pipe = None
+            with self._pipe_lock:
+                if self._pipe is not None:
+                    return
+                try:
+                    self._pipe = pipeline("text2text-generation", model=self.model_name)
+                except Exception:
+                    self._pipe = None
 
     def _hosted_enhance(self, prompt: str, max_new_tokens: int) -> Optional[str]:
         endpoint = os.getenv("ENHANCER_ENDPOINT")
-        if not endpoint or urllib is None:
+        if not endpoint:
+            return None
+        headers = {"Content-Type": "application/json"}
+        api_key = os.getenv("ENHANCER_API_KEY")
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        payload = _dumps(
+            {
+                "prompt": prompt,
+                "max_new_tokens": max_new_tokens,
+            }
+        )
+        client = _get_http_client()
+        if client is not None:
+            try:
+                resp = client.post(endpoint, content=payload, headers=headers)
+                resp.raise_for_status()
+                return _parse_hosted_body(resp.text)
+            except Exception:
+                return None
+        if urllib is None:
             return None
         try:
-            payload = json.dumps(
-                {
-                    "prompt": prompt,
-                    "max_new_tokens": max_new_tokens,
-                }
-            ).encode("utf-8")
-            req = urllib.request.Request(endpoint, data=payload, headers={"Content-Type": "application/json"})
-            api_key = os.getenv("ENHANCER_API_KEY")
-            if api_key:
-                req.add_header("Authorization", f"Bearer {api_key}")
+            req = urllib.request.Request(endpoint, data=payload, headers=headers)
             with urllib.request.urlopen(req, timeout=15) as resp:  # nosec B310
-                body = resp.read().decode("utf-8")
-                try:
-                    data = json.loads(body)
-                    # accept either {"text": "..."} or raw string
-                    if isinstance(data, dict) and "text" in data:
-                        return str(data["text"]).strip()
-                    return str(data).strip()
-                except Exception:
-                    return body.strip()
+                return _parse_hosted_body(resp.read().decode("utf-8"))
         except Exception:
             return None
 
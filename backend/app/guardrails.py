@@ -4,6 +4,11 @@ import json
 import re
 from typing import Dict, Any, Tuple
 
+try:  # orjson is optional; fall back to the stdlib parser
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads  # type: ignore[assignment]
+
 
 def apply_domain_caps(category: str, hparams: Dict[str, Any]) -> Dict[str, Any]:
     """For law/medical, cap temperature <= 0.3."""
@@ -16,28 +21,39 @@ def apply_domain_caps(category: str, hparams: Dict[str, Any]) -> Dict[str, Any]:
 
 
 _INJECTION_PATTERNS = [
-    r"(?i)ignore (all|any|previous|earlier) instructions",
-    r"(?i)disregard (all|any|previous|earlier) instructions",
-    r"(?i)you are (now )?a (?:different|new) (?:assistant|model|persona)",
-    r"(?i)system prompt",
-    r"(?i)developer mode",
-    r"(?i)prompt injection",
-    r"(?i)jailbreak",
-    r"(?i)\bDAN\b",
+    r"ignore (all|any|previous|earlier) instructions",
+    r"disregard (all|any|previous|earlier) instructions",
+    r"you are (now )?a (?:different|new) (?:assistant|model|persona)",
+    r"system prompt",
+    r"developer mode",
+    r"prompt injection",
+    r"jailbreak",
+    r"\bDAN\b",
 ]
+# One alternation, one case-insensitive flag: the text is scanned once instead of once per pattern
+_INJECTION_RE = re.compile("|".join(f"(?:{p})" for p in _INJECTION_PATTERNS), re.IGNORECASE)
+_CODEFENCE_RE = re.compile(r"```[a-zA-Z0-9_-]*\n?")
+_MULTINL_RE = re.compile(r"\n{3,}")
+# Anything any of the rewrites below would touch; clean input is scanned once and returned as-is
+_NEEDS_SANITIZE_RE = re.compile(rf"{_INJECTION_RE.pattern}|```|\n{{3,}}", re.IGNORECASE)
 
 
 def sanitize_text(text: str) -> str:
     """Strip common prompt-injection phrases and obfuscations from text.
     This is a conservative hygiene step; it does not attempt to fully neutralize attacks.
     """
-    cleaned = text
-    for pat in _INJECTION_PATTERNS:
-        cleaned = re.sub(pat, "", cleaned)
+    if _NEEDS_SANITIZE_RE.search(text) is None:
+        # str.strip() hands back the same object when there is nothing to strip
+        return text.strip()
+    # Removing one phrase can splice together another ("system ignore all instructionsprompt");
+    # repeat the pass until nothing matches, as the old one-pattern-at-a-time loop did
+    cleaned, n = _INJECTION_RE.subn("", text)
+    while n:
+        cleaned, n = _INJECTION_RE.subn("", cleaned)
     # Remove stray control fence attempts
-    cleaned = re.sub(r"```[a-zA-Z0-9_-]*\n?", "", cleaned)
+    cleaned = _CODEFENCE_RE.sub("", cleaned)
     # Collapse excessive whitespace
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = _MULTINL_RE.sub("\n\n", cleaned)
     return cleaned.strip()
 
 
@@ -46,7 +62,7 @@ def validate_json_if_required(force_json: bool, content: str) -> Tuple[bool, str
     if not force_json:
         return True, content
     try:
-        json.loads(content)
+        _json_loads(content)
         return True, content
     except Exception:
         # Attempt a naive auto-repair by trimming to first/last braces
@@ -55,7 +71,7 @@ def validate_json_if_required(force_json: bool, content: str) -> Tuple[bool, str
             end = content.rfind("}")
             if start != -1 and end != -1 and end > start:
                 candidate = content[start : end + 1]
-                json.loads(candidate)
+                _json_loads(candidate)
                 return True, candidate
         except Exception:
             pass
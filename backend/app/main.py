@@ -1,13 +1,17 @@
 """FastAPI app exposing routes for choose, feedback, history, recipes."""
 from __future__ import annotations
 import os
-import uuid
+import hashlib
 import logging
 import asyncio
+import threading
+import time
+from datetime import datetime, UTC
 from typing import Optional
 
-from fastapi import FastAPI, Depends, Query, HTTPException, Body
+from fastapi import FastAPI, Depends, Query, HTTPException, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import case, delete, func, insert, literal, select
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
 
@@ -23,13 +27,14 @@ from .schemas import (
     StatsResponse,
     StatsItem,
 )
-from .db import get_db, init_db, Decision, Feedback
-from .recipes import RecipeModel, RecipesCache, RecipeError, filter_recipes
+from .db import get_db, init_db, new_decision_id, BanditStats, Decision, Feedback, WINDOW_FUNCTIONS
+from .decision_writer import DecisionWriter
+from .recipes import RecipeModel, RecipesCache, RecipeError
 from .optimizer import select_recipe, get_optimizer_stats
 from .enhancer import Enhancer
 from .guardrails import apply_domain_caps, sanitize_text
 from . import metrics  # ensure metrics is imported for endpoints that reference it
-from .bandit import BanditService, BanditConfig
+from .bandit import BanditService, BanditConfig, BanditStatsRepository, invalidate_stats_cache
 from .logging_config import configure_logging
 
 # Phase B: allow PROMPT_TEMPLATES_DIR to override RECIPES_DIR; default to repo prompt-templates directory.
@@ -52,6 +57,8 @@ BANDIT_OPTIMISTIC_INITIAL_VALUE = float(os.getenv("BANDIT_OPTIMISTIC_INITIAL_VAL
 RELOAD_MODE = os.getenv("RECIPES_RELOAD_MODE", "events").lower()  # events|poll|off
 RELOAD_INTERVAL_SECONDS = int(os.getenv("RECIPES_RELOAD_INTERVAL_SECONDS", "5"))
 RELOAD_DEBOUNCE_MS = int(os.getenv("RECIPES_DEBOUNCE_MS", "300"))
+# Minimum seconds between on-request recipe mtime checks when no watcher is running
+RECIPES_CHECK_TTL_SECONDS = float(os.getenv("RECIPES_CHECK_TTL_SECONDS", "1"))
 
 # Try import watchfiles (optional)
 try:
@@ -59,13 +66,22 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     awatch = None  # type: ignore
 
+# orjson-backed responses when available (pinned in requirements); stdlib JSON otherwise
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+except ImportError:  # pragma: no cover - optional dependency
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
 # Logging configuration (structured JSON)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 configure_logging(LOG_LEVEL)
 logger = logging.getLogger("prompt_console")
 
-app = FastAPI(title="Prompt Console API", version="0.1.0")
-app.state.recipes_cache = RecipesCache(RECIPES_DIR)
+app = FastAPI(title="Prompt Console API", version="0.1.0", default_response_class=_DefaultResponse)
+# Always present (and always a float) so handlers read it directly; POST /stats replaces it
+app.state.epsilon = DEFAULT_EPSILON
+app.state.recipes_cache = RecipesCache(RECIPES_DIR, check_ttl_seconds=RECIPES_CHECK_TTL_SECONDS)
 
 # CORS policy driven by environment
 _ENV = os.getenv("ENV", "dev").lower()
@@ -89,12 +105,56 @@ def healthz():
     return {"ok": True}
 
 
+async def _coalesce_changes(batches, window_s: float):
+    """Merge change batches that arrive within ``window_s`` of each other into one set of paths.
+
+    watchfiles already debounces inside a batch; a burst such as a git checkout can still
+    span several batches, and each would otherwise trigger its own reload.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def pump() -> None:
+        # A separate task owns the iterator so timing out a wait never cancels the watcher
+        try:
+            async for batch in batches:
+                await queue.put(batch)
+        finally:
+            await queue.put(done)
+
+    producer = asyncio.create_task(pump())
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is done:
+                break
+            pending = {str(p) for (_change, p) in batch}
+            finished = False
+            while True:
+                try:
+                    batch = await asyncio.wait_for(queue.get(), timeout=window_s)
+                except asyncio.TimeoutError:
+                    break
+                if batch is done:
+                    finished = True
+                    break
+                pending.update(str(p) for (_change, p) in batch)
+            yield pending
+            if finished:
+                break
+        # Surface a watcher failure to the caller
+        await producer
+    finally:
+        producer.cancel()
+
+
 async def _recipes_watch_loop():
     """Background task to watch recipes directory and trigger reloads."""
     cache: RecipesCache = app.state.recipes_cache
 
-    # Initial load
-    cache.ensure_loaded(force=True, reason="startup")
+    # Initial load; YAML parsing and file stats run in a worker thread so the event loop
+    # keeps serving requests during (re)loads
+    await asyncio.to_thread(cache.ensure_loaded, True, "startup")
 
     mode = RELOAD_MODE
     if mode == "off":
@@ -110,11 +170,12 @@ async def _recipes_watch_loop():
             RELOAD_DEBOUNCE_MS,
         )
         try:
-            async for changes in awatch(RECIPES_DIR, debounce=RELOAD_DEBOUNCE_MS):
+            batches = awatch(RECIPES_DIR, debounce=RELOAD_DEBOUNCE_MS, step=50)
+            async for changed in _coalesce_changes(batches, RELOAD_DEBOUNCE_MS / 1000.0):
                 try:
-                    changed_paths = [str(p) for (_change, p) in changes]
+                    changed_paths = sorted(changed)
                     if any(p.endswith(".yaml") for p in changed_paths):
-                        cache.apply_fs_events(changed_paths, reason="events")
+                        await asyncio.to_thread(cache.apply_fs_events, changed_paths, "events")
                 except Exception as e:
                     logger.exception("recipes.watch event handling failed: %s", e)
         except asyncio.CancelledError:
@@ -128,17 +189,20 @@ async def _recipes_watch_loop():
     if (mode == "poll") or not use_events:
         interval = max(1, int(RELOAD_INTERVAL_SECONDS))
         logger.info("recipes.poll starting interval_seconds=%d dir=%s", interval, RECIPES_DIR)
-        try:
-            while True:
-                cache.ensure_loaded(force=False, reason="poll")
+        while True:
+            try:
+                await asyncio.to_thread(cache.ensure_loaded, False, "poll")
+            except asyncio.CancelledError:
+                logger.info("recipes.poll cancelled")
+                return
+            except Exception as e:
+                # Keep looping after logging
+                logger.exception("recipes.poll loop error: %s", e)
+            try:
                 await asyncio.sleep(interval)
-        except asyncio.CancelledError:
-            logger.info("recipes.poll cancelled")
-            return
-        except Exception as e:
-            logger.exception("recipes.poll loop error: %s", e)
-            # Keep looping after logging
-            await asyncio.sleep(interval)
+            except asyncio.CancelledError:
+                logger.info("recipes.poll cancelled")
+                return
 
 
 # Lifespan handler replacing deprecated on_event startup/shutdown
@@ -147,6 +211,8 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
     app.state.epsilon = DEFAULT_EPSILON
+    # Shared enhancer built once here rather than on the first enhanced /choose
+    app.state.enhancer = _get_enhancer() if ENHANCER_ENABLED else None
     # Optional rate-limit stub middleware (no-op in M0)
     try:
         if os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true":
@@ -197,7 +263,11 @@ async def lifespan(app: FastAPI):
     # Yield control to run the app
     yield
 
-    # Shutdown
+    # Shutdown: persist queued decisions first; their ids were already returned by /choose
+    try:
+        await asyncio.to_thread(_DECISION_WRITER.close)
+    except Exception as e:
+        logger.exception("decision_writer_close_failed: %s", e)
     task = getattr(app.state, "recipes_reload_task", None)
     if task is not None:
         task.cancel()
@@ -210,14 +280,44 @@ async def lifespan(app: FastAPI):
 app.router.lifespan_context = lifespan
 
 
+def _recipes_watcher_active(cache: RecipesCache) -> bool:
+    task = getattr(app.state, "recipes_reload_task", None)
+    return task is not None and not task.done() and cache.loaded
+
+
 # Recipes cache: serve last-known-good; allow force reload via flag
 def _load_recipe_cache(force: bool = False) -> tuple[list[RecipeModel], list[RecipeError]]:
     cache = getattr(app.state, "recipes_cache")
+    if not force and _recipes_watcher_active(cache):
+        # The watcher/poller owns freshness; skip the per-request stat of every recipe file
+        return cache.snapshot()
     reason = "manual" if force else "api"
     recipes, errors = cache.ensure_loaded(force=force, reason=reason)
     return recipes, errors
 
 
+# Enhancer singleton, published as app.state.enhancer at startup; the local pipeline is
+# still built lazily on first enhance() and reused afterwards
+_ENHANCER: Optional[Enhancer] = None
+_ENHANCER_LOCK = threading.Lock()
+
+
+def _get_enhancer() -> Enhancer:
+    global _ENHANCER
+    if _ENHANCER is None:
+        with _ENHANCER_LOCK:
+            if _ENHANCER is None:
+                _ENHANCER = Enhancer()
+    return _ENHANCER
+
+
+# Decision rows are written off the request path in batched commits
+_DECISION_WRITER = DecisionWriter(
+    batch_max=int(os.getenv("DECISION_BATCH_MAX", "64")),
+    batch_ms=float(os.getenv("DECISION_BATCH_MS", "5")),
+)
+
+
 @app.post("/choose", response_model=ChooseResponse)
 def choose(req: ChooseRequest, db: Session = Depends(get_db)):
     try:
@@ -226,7 +326,7 @@ def choose(req: ChooseRequest, db: Session = Depends(get_db)):
             # No valid recipes available due to parse/validation errors
             raise HTTPException(status_code=503, detail={"code": "recipes_unavailable", "message": "No valid recipes available, see /recipes for details"})
         # Tiered candidate filtering
-        candidates, tier, tier_notes = filter_recipes(recipes, req.assistant, req.category)
+        candidates, tier, tier_notes = app.state.recipes_cache.get_filtered(req.assistant, req.category)
         if not candidates:
             raise HTTPException(status_code=404, detail={"code": "no_recipes_available", "message": "No recipes match the requested assistant/category"})
         pre_notes: list[str] = tier_notes
@@ -235,7 +335,7 @@ def choose(req: ChooseRequest, db: Session = Depends(get_db)):
         raw = req.raw_input
         notes: list[str] = []
         if ENHANCER_ENABLED and req.options.get("enhance"):
-            enh = Enhancer()
+            enh = getattr(app.state, "enhancer", None) or _get_enhancer()
             enhanced = enh.enhance(raw, req.assistant, req.category)
             raw = enhanced
             notes.append("enhanced=true")
@@ -253,7 +353,7 @@ def choose(req: ChooseRequest, db: Session = Depends(get_db)):
             notes.append("sanitized=false")
 
         # Selection via optimizer or bandit
-        epsilon = float(getattr(app.state, "epsilon", DEFAULT_EPSILON))
+        epsilon = app.state.epsilon
         explored_flag = None
         if BANDIT_ENABLED and hasattr(app.state, "bandit_service") and app.state.bandit_service is not None:
             try:
@@ -287,32 +387,34 @@ def choose(req: ChooseRequest, db: Session = Depends(get_db)):
             notes.append("temperature_capped=true")
 
         # Persist decision
-        decision_id = str(uuid.uuid4())
-        dec = Decision(
-            id=decision_id,
-            assistant=req.assistant,
-            category=req.category,
-            recipe_id=recipe.id,
-            propensity=propensity,
-        )
-        dec.set_context_dict({
-            "input_tokens": req.context_features.get("input_tokens", 0),
-            "language": req.context_features.get("language", req.context_features.get("lang", "en")),
-            "force_json": force_json,
-            "enhanced": "enhanced=true" in notes,
-        })
-        dec.set_hparams_dict(hparams)
-        dec.set_operators_list(applied_ops)
+        decision_id = new_decision_id()
+        decision_values = {
+            "id": decision_id,
+            "assistant": req.assistant,
+            "category": req.category,
+            "recipe_id": recipe.id,
+            "propensity": propensity,
+            "context": {
+                "input_tokens": req.context_features.get("input_tokens", 0),
+                "language": req.context_features.get("language", req.context_features.get("lang", "en")),
+                "force_json": force_json,
+                "enhanced": "enhanced=true" in notes,
+            },
+            "hparams": hparams,
+            "operators": applied_ops,
+        }
         # Decide whether to persist raw/engineered text
         per_request_store = bool(req.context_features.get("store_text", False))
         if STORE_TEXT or per_request_store:
-            dec.raw_input = req.raw_input
-            dec.engineered_prompt = prompt
+            decision_values["raw_input"] = req.raw_input
+            decision_values["engineered_prompt"] = prompt
             notes.append("store_text=true")
         else:
             notes.append("store_text=false")
-        db.add(dec)
+        # Flush the selection's own writes (bandit counters); the decision row is queued for
+        # the batch writer
         db.commit()
+        _DECISION_WRITER.submit(decision_values)
 
         return ChooseResponse(
             decision_id=decision_id,
@@ -328,25 +430,56 @@ def choose(req: ChooseRequest, db: Session = Depends(get_db)):
     except Exception as e:
         logger.exception("choose_failed: %s", e)
         raise HTTPException(status_code=500, detail=f"choose_failed: {type(e).__name__}")
+
+
+def _insert_feedback_for_decision(db: Session, values: dict) -> bool:
+    """Insert a feedback row only if its decision exists; True when a row was written."""
+    cols = Feedback.__table__.c
+    row = select(
+        Decision.id,
+        literal(values["ts"], cols.ts.type),
+        literal(values["reward"], cols.reward.type),
+        literal(values["components"], cols.components.type),
+        literal(values["safety_flags"], cols.safety_flags.type),
+    ).where(Decision.id == values["decision_id"])
+    stmt = insert(Feedback).from_select(["decision_id", "ts", "reward", "components", "safety_flags"], row)
+    return db.execute(stmt).rowcount > 0
+
+
 @app.post("/feedback", response_model=FeedbackResponse)
 def feedback(req: FeedbackRequest, db: Session = Depends(get_db)):
     try:
-        # Validate decision exists
-        d = db.query(Decision).filter(Decision.id == req.decision_id).first()
-        if d is None:
-            raise HTTPException(status_code=404, detail="decision_not_found")
-        fb = Feedback(
-            decision_id=req.decision_id,
-            reward=float(req.reward),
-        )
-        fb.set_components_dict({k: float(v) for k, v in req.reward_components.items()})
-        fb.set_safety_flags_list(list(req.safety_flags))
-        db.add(fb)
-        # Update bandit persistent stats if available
-        if hasattr(app.state, "bandit_service"):
-            bs: BanditService = app.state.bandit_service
+        values = {
+            "decision_id": req.decision_id,
+            "ts": datetime.now(UTC),
+            "reward": float(req.reward),
+            "components": {k: float(v) for k, v in req.reward_components.items()},
+            "safety_flags": list(req.safety_flags),
+        }
+        bs: Optional[BanditService] = getattr(app.state, "bandit_service", None)
+        if bs is None:
+            # Existence check and write in one statement: INSERT ... SELECT FROM decisions WHERE id = :id
+            if not _insert_feedback_for_decision(db, values):
+                # The decision may still be sitting in the writer queue. End the (empty) write
+                # transaction first: on SQLite it holds the write lock the writer needs
+                db.rollback()
+                _DECISION_WRITER.flush()
+                if not _insert_feedback_for_decision(db, values):
+                    raise HTTPException(status_code=404, detail="decision_not_found")
+        else:
+            # Bandit stats need the decision's group, so look it up first; only those columns
+            lookup = select(Decision.assistant, Decision.category, Decision.recipe_id).where(Decision.id == req.decision_id)
+            d = db.execute(lookup).first()
+            if d is None:
+                _DECISION_WRITER.flush()
+                d = db.execute(lookup).first()
+            if d is None:
+                raise HTTPException(status_code=404, detail="decision_not_found")
+            # Core insert: no ORM object, identity map or unit-of-work flush for a write-only row
+            db.execute(insert(Feedback).values(**values))
             bs.record_feedback(db, d.assistant, d.category, d.recipe_id, float(req.reward))
         db.commit()
+        _bump_feedback_version()
         return FeedbackResponse(ok=True)
     except HTTPException:
         raise
@@ -364,38 +497,147 @@ def history(
     db: Session = Depends(get_db),
 ):
     try:
-        q = db.query(Decision)
+        _DECISION_WRITER.flush()
+        filters = []
         if assistant:
-            q = q.filter(Decision.assistant == assistant)
+            filters.append(Decision.assistant == assistant)
         if category:
-            q = q.filter(Decision.category == category)
-        total = q.count()
-        rows = q.order_by(Decision.ts.desc()).limit(limit).offset(offset).all()
-
-        items: list[HistoryItem] = []
-        for d in rows:
-            items.append(
-                HistoryItem(
-                    id=d.id,
-                    timestamp=d.ts,
-                    assistant=d.assistant,
-                    category=d.category,
-                    recipe_id=d.recipe_id,
-                    propensity=d.propensity,
-                    reward=d.feedback_record.reward if d.feedback_record else None,
-                    operators=d.get_operators_list(),
-                    raw_input=d.raw_input if with_text else None,
-                    engineered_prompt=d.engineered_prompt if with_text else None,
-                )
+            filters.append(Decision.category == category)
+        # Only the columns the response needs, with the reward from a LEFT JOIN, instead of
+        # full ORM objects plus a relationship load
+        columns = [
+            Decision.id,
+            Decision.ts,
+            Decision.assistant,
+            Decision.category,
+            Decision.recipe_id,
+            Decision.propensity,
+            Decision.operators,
+            Feedback.reward,
+        ]
+        if with_text:
+            # The stored prompt text is the bulk of a row; only read it when it is returned
+            columns += [Decision.raw_input, Decision.engineered_prompt]
+        page = (
+            select(*columns)
+            .outerjoin(Feedback, Feedback.decision_id == Decision.id)
+            .where(*filters)
+            .order_by(Decision.ts.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        total = None
+        if WINDOW_FUNCTIONS:
+            # COUNT(*) OVER () returns the filtered total on every page row: one scan, not two
+            rows = db.execute(page.add_columns(func.count().over().label("total"))).all()
+            if rows:
+                total = rows[0].total
+        else:
+            rows = db.execute(page).all()
+        if total is None:
+            # Window unavailable, or the page is past the end and carried no rows to read it from
+            total = db.query(func.count(Decision.id)).filter(*filters).scalar() or 0
+
+        # Rows come straight from our own tables, so skip per-field validation
+        items = [
+            HistoryItem.model_construct(
+                id=r.id,
+                timestamp=r.ts,
+                assistant=r.assistant,
+                category=r.category,
+                recipe_id=r.recipe_id,
+                propensity=r.propensity,
+                reward=r.reward,
+                operators=r.operators or [],
+                raw_input=r.raw_input if with_text else None,
+                engineered_prompt=r.engineered_prompt if with_text else None,
             )
+            for r in rows
+        ]
 
         return HistoryResponse(items=items, total=total, limit=limit, offset=offset)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"history_failed: {type(e).__name__}")
 
 
+def _recipes_payload(recipes: list[RecipeModel], errors: list[RecipeError]) -> tuple[list[RecipeSchema], list[dict]]:
+    """Convert cache contents to the API schema, with a severity on each validation issue."""
+    # Convert to API schema and include validation issues
+    api_recipes: list[RecipeSchema] = []
+    for r in recipes:
+        api_recipes.append(
+            RecipeSchema(
+                id=r.id,
+                assistant=r.assistant,
+                category=r.category,
+                operators=r.operators,
+                hparams=r.hparams,
+                guards=r.guards,
+                examples=r.examples,
+            )
+        )
+    error_objs = []
+    for err in errors:
+        severity = "warning" if getattr(err, "error_type", None) == "semantic_validation" else "error"
+        error_objs.append({
+            "file_path": err.file_path,
+            "error": err.error,
+            "line_number": err.line_number,
+            "error_type": getattr(err, "error_type", None),
+            "severity": severity,
+        })
+    return api_recipes, error_objs
+
+
+# (cache, cache version, encoded RecipesResponse, ETag) for the last body served without deps
+_recipes_body: Optional[tuple[RecipesCache, int, bytes, str]] = None
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    tag = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == tag for t in if_none_match.split(","))
+
+
+def _recipes_response(request: Request, reload: bool, deps: bool):
+    """Shared body of /prompt-templates and its /recipes alias."""
+    global _recipes_body
+    recipes, errors = _load_recipe_cache(force=bool(reload))
+    cache = getattr(app.state, "recipes_cache")
+    if not deps:
+        # The serialized body only changes when the cache publishes a new version
+        version = cache.version
+        hit = _recipes_body
+        if hit is None or hit[0] is not cache or hit[1] != version:
+            recipes, errors = cache.snapshot()
+            api_recipes, error_objs = _recipes_payload(recipes, errors)
+            body = RecipesResponse(recipes=api_recipes, errors=error_objs).model_dump_json().encode("utf-8")
+            # Content hash, so every worker serving the same recipes hands out the same tag
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            hit = _recipes_body = (cache, version, body, etag)
+        headers = {"ETag": hit[3]}
+        if _etag_matches(request.headers.get("if-none-match"), hit[3]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=hit[2], media_type="application/json", headers=headers)
+    api_recipes, error_objs = _recipes_payload(recipes, errors)
+    result = {"recipes": api_recipes, "errors": error_objs}
+    try:
+        by_id, by_file = cache.get_deps()
+        result["deps"] = {
+            "by_id": by_id,
+            "by_file": by_file,
+        }
+    except Exception:
+        pass
+    return result
+
+
 @app.get("/recipes", response_model=RecipesResponse)
-def recipes(reload: bool = False, deps: bool = False):
+def recipes(request: Request, reload: bool = False, deps: bool = False):
     try:
         # Deprecation notice for legacy path (canonical: /prompt-templates)
         if os.getenv("LOG_DEPRECATIONS", "true").lower() == "true":
@@ -403,52 +645,16 @@ def recipes(reload: bool = False, deps: bool = False):
                 logger.warning("DEPRECATED: /recipes hit; use /prompt-templates instead")
             except Exception:
                 pass
-        recipes, errors = _load_recipe_cache(force=bool(reload))
-        # Convert to API schema and include validation issues
-        api_recipes: list[RecipeSchema] = []
-        for r in recipes:
-            api_recipes.append(
-                RecipeSchema(
-                    id=r.id,
-                    assistant=r.assistant,
-                    category=r.category,
-                    operators=r.operators,
-                    hparams=r.hparams,
-                    guards=r.guards,
-                    examples=r.examples,
-                )
-            )
-        error_objs = []
-        for err in errors:
-            severity = "warning" if getattr(err, "error_type", None) == "semantic_validation" else "error"
-            error_objs.append({
-                "file_path": err.file_path,
-                "error": err.error,
-                "line_number": err.line_number,
-                "error_type": getattr(err, "error_type", None),
-                "severity": severity,
-            })
-        result = {"recipes": api_recipes, "errors": error_objs}
-        if deps:
-            cache = getattr(app.state, "recipes_cache")
-            try:
-                by_id, by_file = cache.get_deps()
-                result["deps"] = {
-                    "by_id": by_id,
-                    "by_file": by_file,
-                }
-            except Exception:
-                pass
-        return result
+        return _recipes_response(request, reload, deps)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"recipes_failed: {type(e).__name__}")
 
 
 # Alias endpoint: returns the same payload as /recipes
 @app.get("/prompt-templates", response_model=RecipesResponse)
-def prompt_templates(reload: bool = False, deps: bool = False):
+def prompt_templates(request: Request, reload: bool = False, deps: bool = False):
     try:
-        return recipes(reload=reload, deps=deps)
+        return _recipes_response(request, reload, deps)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"prompt_templates_failed: {type(e).__name__}")
 
@@ -495,30 +701,25 @@ def get_diagnostics():
 @app.get("/bandit_stats")
 def get_bandit_stats(assistant: Optional[str] = None, category: Optional[str] = None, db: Session = Depends(get_db)):
     # Return current BanditStats snapshot with avg_reward
-    # We will pull BanditStats directly to avoid expensive joins
-    from .db import BanditStats as _BS
-    bsq = db.query(_BS).filter(True)
+    # We will pull BanditStats directly to avoid expensive joins; the mean is computed in SQL
+    t = BanditStats.__table__
+    stmt = select(
+        t.c.assistant,
+        t.c.category,
+        t.c.recipe_id,
+        t.c.sample_count,
+        t.c.reward_sum,
+        case((t.c.sample_count > 0, t.c.reward_sum / t.c.sample_count), else_=0.0).label("avg_reward"),
+        t.c.explore_count,
+        t.c.exploit_count,
+        t.c.updated_at,
+    )
     if assistant:
-        bsq = bsq.filter(_BS.assistant == assistant)
+        stmt = stmt.where(t.c.assistant == assistant)
     if category:
-        bsq = bsq.filter(_BS.category == category)
-    rows = []
-    for r in bsq.all():
-        cnt = int(r.sample_count or 0)
-        s = float(r.reward_sum or 0.0)
-        avg = (s / cnt) if cnt > 0 else 0.0
-        rows.append({
-            "assistant": r.assistant,
-            "category": r.category,
-            "recipe_id": r.recipe_id,
-            "sample_count": cnt,
-            "reward_sum": s,
-            "avg_reward": avg,
-            "explore_count": int(r.explore_count or 0),
-            "exploit_count": int(r.exploit_count or 0),
-            "updated_at": r.updated_at,
-        })
-    return {"items": rows, "epsilon": float(getattr(app.state, "epsilon", DEFAULT_EPSILON))}
+        stmt = stmt.where(t.c.category == category)
+    rows = [dict(r) for r in db.execute(stmt).mappings()]
+    return {"items": rows, "epsilon": app.state.epsilon}
 
 
 @app.post("/bandit_config")
@@ -537,7 +738,7 @@ def set_bandit_config(
             bs.config.min_initial_samples = int(min_initial_samples)
         if optimistic_initial_value is not None:
             bs.config.optimistic_initial_value = float(optimistic_initial_value)
-    return {"epsilon": float(getattr(app.state, "epsilon", DEFAULT_EPSILON)), "config": {
+    return {"epsilon": app.state.epsilon, "config": {
         "min_initial_samples": getattr(app.state.bandit_service.config, "min_initial_samples", None) if hasattr(app.state, "bandit_service") else None,
         "optimistic_initial_value": getattr(app.state.bandit_service.config, "optimistic_initial_value", None) if hasattr(app.state, "bandit_service") else None,
     }}
@@ -546,8 +747,6 @@ def set_bandit_config(
 @app.post("/bandit_backfill")
 def bandit_backfill(assistant: Optional[str] = Body(None), category: Optional[str] = Body(None), db: Session = Depends(get_db)):
     # Aggregate Decision+Feedback and seed BanditStats
-    from sqlalchemy import func
-    from .db import BanditStats as _BS
     q = (
         db.query(
             Decision.assistant,
@@ -563,27 +762,68 @@ def bandit_backfill(assistant: Optional[str] = Body(None), category: Optional[st
         q = q.filter(Decision.assistant == assistant)
     if category:
         q = q.filter(Decision.category == category)
-    inserted = 0
-    for a, c, rid, cnt, s in q.all():
-        row = db.query(_BS).filter(_BS.assistant == a, _BS.category == c, _BS.recipe_id == rid).first()
-        if row is None:
-            row = _BS(assistant=a, category=c, recipe_id=rid, sample_count=int(cnt or 0), reward_sum=float(s or 0.0))
-            db.add(row)
-        else:
-            row.sample_count = int(cnt or 0)
-            row.reward_sum = float(s or 0.0)
-        inserted += 1
+    rows = [
+        {"assistant": a, "category": c, "recipe_id": rid, "sample_count": int(cnt or 0), "reward_sum": float(s or 0.0)}
+        for a, c, rid, cnt, s in q.all()
+    ]
+    # One upsert for every group instead of a SELECT plus INSERT/UPDATE per group
+    BanditStatsRepository().set_feedback_totals(db, rows)
     db.commit()
-    return {"ok": True, "rows": inserted}
+    for group in {(r["assistant"], r["category"]) for r in rows}:
+        invalidate_stats_cache(*group)
+    return {"ok": True, "rows": len(rows)}
 
 
 @app.get("/metrics")
 def metrics_endpoint():
     data, content_type = metrics.metrics_response()
-    from fastapi import Response
     return Response(content=data, media_type=content_type)
 
 
+# /stats responses keyed by (assistant, category, feedback version, epsilon). Feedback
+# writes in this process bump the version; the TTL bounds staleness from other workers.
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "10"))
+_STATS_CACHE_MAX_ENTRIES = 256
+_stats_cache: dict[tuple, tuple[float, StatsResponse]] = {}
+_stats_lock = threading.Lock()
+_feedback_version = 0
+
+
+def _bump_feedback_version() -> None:
+    global _feedback_version
+    with _stats_lock:
+        _feedback_version += 1
+        _stats_cache.clear()
+
+
+def _cached_stats(db: Session, assistant: Optional[str], category: Optional[str]) -> StatsResponse:
+    epsilon = app.state.epsilon
+    key = (assistant, category, _feedback_version, epsilon)
+    now = time.monotonic()
+    hit = _stats_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    items = [
+        StatsItem(
+            assistant=row["assistant"],
+            category=row["category"],
+            recipe_id=row["recipe_id"],
+            mean_reward=row["mean_reward"],
+            count=row["count"],
+        )
+        for row in get_optimizer_stats(db, assistant=assistant, category=category)
+    ]
+    resp = StatsResponse(epsilon=epsilon, items=items)
+    if STATS_CACHE_TTL_SECONDS > 0:
+        with _stats_lock:
+            # Drop the entry if a feedback write landed while we were querying
+            if key[2] == _feedback_version:
+                if len(_stats_cache) >= _STATS_CACHE_MAX_ENTRIES:
+                    _stats_cache.clear()
+                _stats_cache[key] = (now + STATS_CACHE_TTL_SECONDS, resp)
+    return resp
+
+
 @app.get("/stats", response_model=StatsResponse)
 def get_stats(
     assistant: Optional[str] = None,
@@ -591,18 +831,7 @@ def get_stats(
     db: Session = Depends(get_db),
 ):
     try:
-        items = [
-            StatsItem(
-                assistant=row["assistant"],
-                category=row["category"],
-                recipe_id=row["recipe_id"],
-                mean_reward=row["mean_reward"],
-                count=row["count"],
-            )
-            for row in get_optimizer_stats(db, assistant=assistant, category=category)
-        ]
-        epsilon = float(getattr(app.state, "epsilon", DEFAULT_EPSILON))
-        return StatsResponse(epsilon=epsilon, items=items)
+        return _cached_stats(db, assistant, category)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"stats_failed: {type(e).__name__}")
 
@@ -623,31 +852,23 @@ def update_stats(
         if reset:
             # Delete feedback rows (optionally filtered by assistant/category)
             if assistant or category:
-                q = db.query(Feedback).join(Decision, Decision.id == Feedback.decision_id)
+                # One DELETE ... WHERE decision_id IN (SELECT ...) instead of loading and deleting rows one by one
+                ids = select(Decision.id)
                 if assistant:
-                    q = q.filter(Decision.assistant == assistant)
+                    ids = ids.where(Decision.assistant == assistant)
                 if category:
-                    q = q.filter(Decision.category == category)
-                deleted = 0
-                for fb in q.all():
-                    db.delete(fb)
-                    deleted += 1
+                    ids = ids.where(Decision.category == category)
+                db.execute(
+                    delete(Feedback).where(Feedback.decision_id.in_(ids)),
+                    execution_options={"synchronize_session": False},
+                )
             else:
-                db.query(Feedback).delete()
+                # Committed right away, so there is no session state worth reconciling
+                db.execute(delete(Feedback), execution_options={"synchronize_session": False})
             db.commit()
-        # Return fresh stats
-        items = [
-            StatsItem(
-                assistant=row["assistant"],
-                category=row["category"],
-                recipe_id=row["recipe_id"],
-                mean_reward=row["mean_reward"],
-                count=row["count"],
-            )
-            for row in get_optimizer_stats(db, assistant=assistant, category=category)
-        ]
-        eps = float(getattr(app.state, "epsilon", DEFAULT_EPSILON))
-        return StatsResponse(epsilon=eps, items=items)
+            _bump_feedback_version()
+        # Return fresh stats (a reset bumps the version; a new epsilon is part of the cache key)
+        return _cached_stats(db, assistant, category)
     except HTTPException:
         raise
     except Exception as e:
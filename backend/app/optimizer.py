@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
-from .db import Decision, Feedback
+from .db import Decision, Feedback, WINDOW_FUNCTIONS
 from .recipes import RecipeModel
 
 
@@ -85,11 +85,44 @@ def _last_n_rewards(db: Session, recipe_id: str, n: int = 3) -> List[float]:
     return [float(r[0]) for r in rows]
 
 
+def _last_n_rewards_by_recipe(db: Session, recipe_ids: List[str], n: int = 3) -> Dict[str, List[float]]:
+    """Return the newest ``n`` rewards for each recipe id in one round trip.
+
+    Falls back to one query per recipe where ROW_NUMBER() OVER is unavailable (SQLite < 3.25).
+    """
+    if not recipe_ids:
+        return {}
+    if WINDOW_FUNCTIONS:
+        rn = func.row_number().over(partition_by=Decision.recipe_id, order_by=Feedback.ts.desc()).label("rn")
+        ranked = (
+            db.query(Decision.recipe_id.label("recipe_id"), Feedback.reward.label("reward"), rn)
+            .join(Feedback, Feedback.decision_id == Decision.id)
+            .filter(Decision.recipe_id.in_(recipe_ids))
+            .subquery()
+        )
+        q = (
+            db.query(ranked.c.recipe_id, ranked.c.reward)
+            .filter(ranked.c.rn <= n)
+            .order_by(ranked.c.recipe_id, ranked.c.rn)
+        )
+        try:
+            rows = q.all()
+        except (OperationalError, ProgrammingError):
+            db.rollback()
+        else:
+            out: Dict[str, List[float]] = {}
+            for recipe_id, reward in rows:
+                out.setdefault(recipe_id, []).append(float(reward))
+            return out
+    return {rid: _last_n_rewards(db, rid, n) for rid in recipe_ids}
+
+
 def _eligible(recipes: List[RecipeModel], db: Session, safety_threshold: float = 0.2) -> List[RecipeModel]:
     """Exclude recipes whose last 3 rewards are all below threshold."""
+    last_by_id = _last_n_rewards_by_recipe(db, list({r.id for r in recipes}), 3)
     eligible = []
     for r in recipes:
-        last3 = _last_n_rewards(db, r.id, 3)
+        last3 = last_by_id.get(r.id, [])
         if len(last3) == 3 and all(rv < safety_threshold for rv in last3):
             continue
         eligible.append(r)
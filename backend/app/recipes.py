@@ -1,18 +1,17 @@
 """Recipe loading and validation utilities with includes/extends/env and incremental validation."""
 from __future__ import annotations
 import os
-import glob
 import time
 import threading
 import logging
 import re
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional, Iterable, Any, Set
 from pathlib import Path
 
 import yaml
 from pydantic import BaseModel, ValidationError, Field
-from dotenv import dotenv_values
 
 # Optional JSON Schema validation (enabled via env or strict mode)
 try:  # pragma: no cover - optional dependency
@@ -52,6 +51,13 @@ class RecipeError:
 MAX_FILE_SIZE_BYTES = int(os.getenv("RECIPES_MAX_FILE_SIZE_BYTES", "262144"))
 
 
+# libyaml-backed loader when PyYAML was built with it; same safe tag set as yaml.safe_load
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+
 def _parse_yaml(path: str) -> Tuple[Optional[dict], Optional[RecipeError]]:
     try:
         try:
@@ -61,7 +67,7 @@ def _parse_yaml(path: str) -> Tuple[Optional[dict], Optional[RecipeError]]:
         if size > MAX_FILE_SIZE_BYTES:
             return None, RecipeError(file_path=path, error=f"file too large: {size} bytes > limit {MAX_FILE_SIZE_BYTES}", error_type="security_validation", line_number=None)
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_SafeLoader) or {}
         return data, None
     except yaml.MarkedYAMLError as e:  # type: ignore[attr-defined]
         line = getattr(getattr(e, 'problem_mark', None), 'line', None)
@@ -72,6 +78,9 @@ def _parse_yaml(path: str) -> Tuple[Optional[dict], Optional[RecipeError]]:
         return None, RecipeError(file_path=path, error=str(e), error_type="io_error", line_number=None)
 
 
+# Cold loads with at least this many changed files parse them on a small thread pool
+PARALLEL_PARSE_MIN_FILES = 4
+
 # Recursive scanning support for recipes subdirectories
 RECIPES_RECURSIVE = os.getenv("RECIPES_RECURSIVE", "0") == "1"
 
@@ -84,6 +93,30 @@ VALIDATION_STRICT_SCOPE_DEFAULT = "all"
 ENV_PATTERN = re.compile(r"\$\{ENV:([A-Za-z_][A-Za-z0-9_]*)(?::-(.*?))?\}")
 
 
+# Set to 1 to parse .env files with python-dotenv (multiline values, escapes, interpolation)
+RECIPES_ENV_USE_DOTENV = os.getenv("RECIPES_ENV_USE_DOTENV", "0") == "1"
+
+
+def _parse_env_text(text: str) -> Dict[str, str]:
+    """Minimal single-pass KEY=VALUE parser for .env files.
+
+    Skips blanks and comments, tolerates an ``export`` prefix and strips one
+    layer of surrounding quotes. Multiline values are left to python-dotenv.
+    """
+    settings: Dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        k, _, v = line.partition("=")
+        k = k.strip()
+        if k.startswith("export "):
+            k = k[7:].strip()
+        if k:
+            settings[k] = v.strip().strip('"').strip("'")
+    return settings
+
+
 def _strict_filter_applies(category: str, strict: bool, scope: str) -> bool:
     """Return True if semantic-invalid recipes should be excluded for this category.
 
@@ -172,7 +205,80 @@ def validate_recipe(recipe: RecipeModel) -> List[str]:
     return issues
 
 
-def filter_recipes(recipes: List[RecipeModel], assistant: str, category: str) -> Tuple[List[RecipeModel], str, List[str]]:
+@dataclass(slots=True, frozen=True)
+class HotRecipe:
+    """Read-only, slotted view of a :class:`RecipeModel` for the /choose hot path.
+
+    Sequences are tuples so they can be handed to the prompt engine without copying;
+    ``hparams``/``guards`` are shared with the source model and must not be mutated.
+    """
+    id: str
+    assistant: str
+    category: str
+    operators: Tuple[str, ...]
+    hparams: Dict[str, object]
+    guards: Dict[str, object]
+    examples: Tuple[str, ...]
+    is_baseline: bool
+
+    @classmethod
+    def from_model(cls, r: RecipeModel) -> "HotRecipe":
+        return cls(
+            id=r.id,
+            assistant=r.assistant,
+            category=r.category,
+            operators=tuple(r.operators),
+            hparams=r.hparams,
+            guards=r.guards,
+            examples=tuple(r.examples),
+            is_baseline=r.id.endswith(".baseline"),
+        )
+
+
+@dataclass
+class RecipeIndex:
+    """Lookup tables over one recipe list, in load order, for :func:`filter_recipes`."""
+    by_pair: Dict[Tuple[str, str], List[HotRecipe]]
+    by_assistant: Dict[str, List[HotRecipe]]
+    by_category: Dict[str, List[HotRecipe]]
+    # First ``*.baseline`` recipe per assistant
+    baseline_by_assistant: Dict[str, HotRecipe]
+    first: Optional[HotRecipe] = None
+    # (assistant, category) -> filter result, filled by RecipesCache.get_filtered
+    filtered: Dict[Tuple[str, str], Tuple[List[HotRecipe], str, List[str]]] = field(default_factory=dict)
+
+
+def index_recipes(recipes: List[RecipeModel]) -> RecipeIndex:
+    """Convert recipes to :class:`HotRecipe` and group them in one pass."""
+    by_pair: Dict[Tuple[str, str], List[HotRecipe]] = {}
+    by_assistant: Dict[str, List[HotRecipe]] = {}
+    by_category: Dict[str, List[HotRecipe]] = {}
+    baselines: Dict[str, HotRecipe] = {}
+    first: Optional[HotRecipe] = None
+    for model in recipes:
+        r = HotRecipe.from_model(model)
+        if first is None:
+            first = r
+        by_pair.setdefault((r.assistant, r.category), []).append(r)
+        by_assistant.setdefault(r.assistant, []).append(r)
+        by_category.setdefault(r.category, []).append(r)
+        if r.is_baseline and r.assistant not in baselines:
+            baselines[r.assistant] = r
+    return RecipeIndex(
+        by_pair=by_pair,
+        by_assistant=by_assistant,
+        by_category=by_category,
+        baseline_by_assistant=baselines,
+        first=first,
+    )
+
+
+def filter_recipes(
+    recipes: List[RecipeModel],
+    assistant: str,
+    category: str,
+    index: Optional[RecipeIndex] = None,
+) -> Tuple[List[RecipeModel | HotRecipe], str, List[str]]:
     """Return candidates with explicit fallback tiers and notes.
 
     Tiers (first non-empty wins):
@@ -181,7 +287,12 @@ def filter_recipes(recipes: List[RecipeModel], assistant: str, category: str) ->
       3) assistant + any category
       4) any assistant + category
       5) any assistant + any category
+
+    ``index`` (from :func:`index_recipes` over the same list) answers every tier with
+    dict lookups instead of scans and returns :class:`HotRecipe` entries.
     """
+    if index is not None:
+        return _filter_indexed(index, assistant, category)
     notes: List[str] = []
     tier = ""
     # Tier 1: exact match
@@ -217,14 +328,41 @@ def filter_recipes(recipes: List[RecipeModel], assistant: str, category: str) ->
     return [], "none", notes
 
 
+def _filter_indexed(index: RecipeIndex, assistant: str, category: str) -> Tuple[List[HotRecipe], str, List[str]]:
+    tier1 = index.by_pair.get((assistant, category))
+    if tier1:
+        return tier1, "assistant+category", ["tier=assistant+category"]
+    baseline = index.baseline_by_assistant.get(assistant)
+    if baseline is not None:
+        return [baseline], "assistant+baseline", ["tier=assistant+baseline"]
+    tier3 = index.by_assistant.get(assistant)
+    if tier3:
+        return [tier3[0]], "assistant+any", ["tier=assistant+any"]
+    tier4 = index.by_category.get(category)
+    if tier4:
+        return [tier4[0]], "any+category", ["tier=any+category"]
+    if index.first is not None:
+        return [index.first], "any+any", ["tier=any+any"]
+    return [], "none", []
+
+
+# Distinct (assistant, category) pairs remembered by RecipesCache.get_filtered
+_FILTERED_MEMO_MAX = 1024
+
+
 class RecipesCache:
-    def __init__(self, recipes_dir: str) -> None:
+    def __init__(self, recipes_dir: str, check_ttl_seconds: float = 0.0) -> None:
         self.recipes_dir = os.path.abspath(recipes_dir)
+        # Non-forced ensure_loaded() calls within this window reuse the last mtime check
+        self._check_ttl_ns = int(max(0.0, float(check_ttl_seconds)) * 1e9)
+        self._next_check_ns = 0
         self._recipes: List[RecipeModel] = []
+        self._index: RecipeIndex = index_recipes([])
         self._errors: List[RecipeError] = []
         self._mtimes: Dict[str, int] = {}
         self._last_loaded_ns: int = 0
-        self._lock = threading.Lock()
+        self._version = 0
+        self._lock = threading.RLock()
         # Advanced state
         self._raw_docs_by_file: Dict[str, Any] = {}
         self._defines_by_file: Dict[str, List[str]] = {}
@@ -241,274 +379,374 @@ class RecipesCache:
         # JSON Schema validator (optional)
         self._json_validator = None
         self._json_schema_loaded = False
+        # Parsed YAML per file, reused while (mtime_ns, size) is unchanged
+        self._parse_cache: Dict[str, Tuple[int, int, Optional[dict], Optional[RecipeError]]] = {}
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever the published recipes or errors change."""
+        return self._version
+
+    @property
+    def loaded(self) -> bool:
+        """True once a load has completed (successfully or with errors)."""
+        return self._last_loaded_ns > 0
 
     def snapshot(self) -> Tuple[List[RecipeModel], List[RecipeError]]:
         return list(self._recipes), list(self._errors)
 
+    @property
+    def index(self) -> RecipeIndex:
+        """Lookup tables for the current snapshot; treat as read-only."""
+        return self._index
+
+    def get_filtered(self, assistant: str, category: str) -> Tuple[List[HotRecipe], str, List[str]]:
+        """:func:`filter_recipes` over the current snapshot, memoized per (assistant, category).
+
+        The returned lists are shared between callers and must not be mutated.
+        """
+        index = self._index
+        # The memo lives on the index, so a reload starts from an empty one
+        memo = index.filtered
+        key = (assistant, category)
+        hit = memo.get(key)
+        if hit is None:
+            hit = _filter_indexed(index, assistant, category)
+            if len(memo) >= _FILTERED_MEMO_MAX:
+                memo.clear()
+            memo[key] = hit
+        return hit
+
+    def _publish(self, models: List[RecipeModel]) -> None:
+        # Build the index before swapping the list so readers never see an empty index
+        index = index_recipes(models)
+        self._recipes = models
+        self._index = index
+
+    def _parse_cached(self, path: str) -> Tuple[Optional[dict], Optional[RecipeError], int]:
+        """Return ``(data, error, mtime_ns)`` for ``path``, re-parsing only when the file changed.
+
+        Parsed documents are shared between loads and must be treated as read-only.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._parse_cache.pop(path, None)
+            data, err = _parse_yaml(path)
+            return data, err, 0
+        cached = self._parse_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], cached[3], st.st_mtime_ns
+        data, err = _parse_yaml(path)
+        self._parse_cache[path] = (st.st_mtime_ns, st.st_size, data, err)
+        return data, err, st.st_mtime_ns
+
+    def _prime_parse_cache(self, paths: List[str]) -> None:
+        """Parse changed files concurrently so the serial load loop only sees cache hits.
+
+        Worth it only on cold or bulk reloads; small batches stay on the calling thread.
+        """
+        stale: List[Tuple[str, int, int]] = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = self._parse_cache.get(path)
+            if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+                stale.append((path, st.st_mtime_ns, st.st_size))
+        if len(stale) < PARALLEL_PARSE_MIN_FILES:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as pool:
+            results = list(pool.map(lambda item: _parse_yaml(item[0]), stale))
+        for (path, mtime_ns, size), (data, err) in zip(stale, results, strict=True):
+            self._parse_cache[path] = (mtime_ns, size, data, err)
+
     def _scan_files(self) -> List[str]:
-        if RECIPES_RECURSIVE:
-            return sorted(glob.glob(os.path.join(self.recipes_dir, "**", "*.yaml"), recursive=True))
-        return sorted(glob.glob(os.path.join(self.recipes_dir, "*.yaml")))
+        # Single os.scandir pass per directory (same matches as glob "*.yaml" / "**/*.yaml":
+        # hidden entries skipped) without glob's pattern machinery and extra stats
+        files: List[str] = []
+        pending = [self.recipes_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        name = entry.name
+                        if name.startswith("."):
+                            continue
+                        if name.endswith(".yaml") and entry.is_file():
+                            files.append(entry.path)
+                        elif RECIPES_RECURSIVE and entry.is_dir():
+                            pending.append(entry.path)
+            except OSError:
+                continue
+        files.sort()
+        return files
 
     # Incremental reload: selectively recompile recipes impacted by fragment changes.
     # For structural changes to top-level recipe files, fall back to full reload.
     def apply_fs_events(self, changed_paths: Iterable[str], reason: str = "events") -> Tuple[List[RecipeModel], List[RecipeError]]:
-        # Ensure we've loaded at least once
-        if not self._compiled_by_id:
-            return self.ensure_loaded(force=True, reason=reason)
-        # Normalize
-        abs_changed = [os.path.abspath(str(p)) for p in changed_paths if str(p).endswith('.yaml')]
-        if not abs_changed:
-            return self.snapshot()
-        # Partition: fragments vs top-level recipe files
-        recipes_dir_abs = os.path.abspath(self.recipes_dir)
-        frags_prefix = os.path.join(recipes_dir_abs, "_fragments") + os.sep
-        changed_fragments: Set[str] = set()
-        for p in abs_changed:
-            # If file no longer exists (deleted/renamed), fall back to full reload for safety
-            if not os.path.exists(p):
-                return self.ensure_loaded(force=True, reason=reason)
-            if p.startswith(frags_prefix):
-                changed_fragments.add(p)
-            else:
-                # If it's a new top-level file or an edited recipe file, do full reload to keep graphs correct
+        # Runs on a worker thread from the watcher; hold the load lock (reentrant, since the
+        # full-reload fallbacks go through ensure_loaded) so request-side loads never interleave
+        with self._lock:
+            # Ensure we've loaded at least once
+            if not self._compiled_by_id:
                 return self.ensure_loaded(force=True, reason=reason)
-        if not changed_fragments:
-            return self.snapshot()
+            # Normalize
+            abs_changed = [os.path.abspath(str(p)) for p in changed_paths if str(p).endswith('.yaml')]
+            if not abs_changed:
+                return self.snapshot()
+            # Partition: fragments vs top-level recipe files
+            recipes_dir_abs = os.path.abspath(self.recipes_dir)
+            frags_prefix = os.path.join(recipes_dir_abs, "_fragments") + os.sep
+            changed_fragments: Set[str] = set()
+            for p in abs_changed:
+                # If file no longer exists (deleted/renamed), fall back to full reload for safety
+                if not os.path.exists(p):
+                    return self.ensure_loaded(force=True, reason=reason)
+                if p.startswith(frags_prefix):
+                    changed_fragments.add(p)
+                else:
+                    # If it's a new top-level file or an edited recipe file, do full reload to keep graphs correct
+                    return self.ensure_loaded(force=True, reason=reason)
+            if not changed_fragments:
+                return self.snapshot()
 
-        # Build reverse includes map: fragment rel path -> set(recipe_file_abs)
-        rev_includes: Dict[str, Set[str]] = {}
-        for file_abs, incs in self._includes_by_file.items():
-            for rel in incs:
-                rev_includes.setdefault(rel, set()).add(file_abs)
+            # Build reverse includes map: fragment rel path -> set(recipe_file_abs)
+            rev_includes: Dict[str, Set[str]] = {}
+            for file_abs, incs in self._includes_by_file.items():
+                for rel in incs:
+                    rev_includes.setdefault(rel, set()).add(file_abs)
 
-        # Compute impacted recipe files by mapping changed fragment abs path -> rel path used as key
-        impacted_recipe_files: Set[str] = set()
-        for frag_abs in changed_fragments:
-            try:
-                rel_posix = Path(frag_abs).resolve().relative_to(Path(recipes_dir_abs).resolve()).as_posix()
-            except Exception:
-                # If the fragment somehow escapes recipes dir, ignore
-                continue
-            for rf in rev_includes.get(rel_posix, set()):
-                impacted_recipe_files.add(rf)
-        if not impacted_recipe_files:
-            # No recipes include these fragments; nothing to do
-            return self.snapshot()
+            # Compute impacted recipe files by mapping changed fragment abs path -> rel path used as key
+            impacted_recipe_files: Set[str] = set()
+            for frag_abs in changed_fragments:
+                try:
+                    rel_posix = Path(frag_abs).resolve().relative_to(Path(recipes_dir_abs).resolve()).as_posix()
+                except Exception:
+                    # If the fragment somehow escapes recipes dir, ignore
+                    continue
+                for rf in rev_includes.get(rel_posix, set()):
+                    impacted_recipe_files.add(rf)
+            if not impacted_recipe_files:
+                # No recipes include these fragments; nothing to do
+                return self.snapshot()
 
-        # Derive impacted ids and closure via extends graph
-        impacted_ids: Set[str] = set()
-        for f in impacted_recipe_files:
-            for rid in self._defines_by_file.get(f, []):
-                impacted_ids.add(rid)
-        # Closure over reverse extends: children that depend on impacted parents should be recompiled
-        queue = list(impacted_ids)
-        while queue:
-            cur = queue.pop(0)
-            for child in self._id_graph_rev.get(cur, set()):
-                if child not in impacted_ids:
-                    impacted_ids.add(child)
-                    queue.append(child)
-        if not impacted_ids:
-            return self.snapshot()
+            # Derive impacted ids and closure via extends graph
+            impacted_ids: Set[str] = set()
+            for f in impacted_recipe_files:
+                for rid in self._defines_by_file.get(f, []):
+                    impacted_ids.add(rid)
+            # Closure over reverse extends: children that depend on impacted parents should be recompiled
+            queue = list(impacted_ids)
+            while queue:
+                cur = queue.pop(0)
+                for child in self._id_graph_rev.get(cur, set()):
+                    if child not in impacted_ids:
+                        impacted_ids.add(child)
+                        queue.append(child)
+            if not impacted_ids:
+                return self.snapshot()
 
-        # Recompile only impacted ids in a safe topological order (restricted to impacted subgraph)
-        strict = os.getenv("VALIDATION_STRICT", "0") == "1"
-        errors: List[RecipeError] = []
-
-        # Topological order within impacted set
-        sub_indeg: Dict[str, int] = {n: 0 for n in impacted_ids}
-        for n in impacted_ids:
-            for p in self._id_graph.get(n, []):
-                if p in impacted_ids:
-                    sub_indeg[n] = sub_indeg.get(n, 0) + 1
-        queue2: List[str] = [n for n, d in sub_indeg.items() if d == 0]
-        visited: Set[str] = set()
-        order: List[str] = []
-        while queue2:
-            n = queue2.pop(0)
-            if n in visited:
-                continue
-            visited.add(n)
-            order.append(n)
-            for child in self._id_graph_rev.get(n, set()):
-                if child in sub_indeg:
-                    sub_indeg[child] = max(0, sub_indeg.get(child, 1) - 1)
-                    if sub_indeg.get(child, 0) == 0:
-                        queue2.append(child)
-        # If any impacted node still has indegree > 0 within subset, cycles exist; fall back to full reload
-        if any(d > 0 for d in sub_indeg.values()):
-            return self.ensure_loaded(force=True, reason=reason)
-
-        # Helper to read fragment (same as in ensure_loaded)
-        def read_fragment(rel: str, ref_file: str) -> Optional[Dict[str, Any]]:
-            abs_path = (Path(self.recipes_dir) / rel)
-            if not abs_path.exists():
-                errors.append(RecipeError(file_path=ref_file, error=f"include not found: {rel}", error_type="cross_file_validation", line_number=None))
-                return None
-            frag_data, perr = _parse_yaml(str(abs_path))
-            if perr is not None:
-                errors.append(perr)
-                return None
-            if not isinstance(frag_data, dict):
-                errors.append(RecipeError(file_path=str(abs_path), error="fragment YAML root must be a mapping", error_type="schema_validation", line_number=None))
-                return None
-            if not self._validate_fragment_schema(frag_data, str(abs_path), ref_file, errors):
-                return None
-            return frag_data
-
-        # Start from current compiled snapshot and update impacted ones
-        compiled_by_id = dict(self._compiled_by_id)
-        last_known_good = self._last_known_good_by_id
-
-        # Recompile in order
-        for rid in order:
-            file_path = self._id_to_file.get(rid)
-            if not file_path:
-                # Should not happen for known ids
-                continue
-            raw = self._raw_docs_by_file.get(file_path, {})
-            merged: Dict[str, Any] = {}
-            block_errors = False
-            # parents
-            for parent in self._id_graph.get(rid, []):
-                if parent in compiled_by_id:
-                    merged = self._deep_merge(merged, compiled_by_id[parent])
-                else:
-                    errors.append(RecipeError(file_path=file_path, error=f"missing parent id '{parent}'", error_type="cross_file_validation", line_number=None))
-                    if strict:
-                        block_errors = True
-            # includes
-            for rel in self._includes_by_file.get(file_path, []):
-                frag = read_fragment(rel, file_path)
-                if frag is None:
-                    if strict:
-                        block_errors = True
+            # Recompile only impacted ids in a safe topological order (restricted to impacted subgraph)
+            strict = os.getenv("VALIDATION_STRICT", "0") == "1"
+            errors: List[RecipeError] = []
+
+            # Topological order within impacted set
+            sub_indeg: Dict[str, int] = {n: 0 for n in impacted_ids}
+            for n in impacted_ids:
+                for p in self._id_graph.get(n, []):
+                    if p in impacted_ids:
+                        sub_indeg[n] = sub_indeg.get(n, 0) + 1
+            queue2: List[str] = [n for n, d in sub_indeg.items() if d == 0]
+            visited: Set[str] = set()
+            order: List[str] = []
+            while queue2:
+                n = queue2.pop(0)
+                if n in visited:
                     continue
-                merged = self._deep_merge(merged, frag)
-            # self
-            merged = self._deep_merge(merged, {k: v for k, v in raw.items() if k not in ("include", "extends")})
-            self._apply_operators_plus(merged)
-            merged = self._apply_env_substitution(merged, file_path=file_path, rid=rid, strict=strict, collect_errors=errors)
-            # operator whitelist validation
-            allowed_ops = {"role_hdr", "constraints", "io_format", "examples", "quality_bar"}
-            ops_val = merged.get("operators", [])
-            if isinstance(ops_val, list):
-                for op in ops_val:
-                    if not isinstance(op, str) or op not in allowed_ops:
-                        errors.append(RecipeError(file_path=file_path, error=f"unknown operator '{op}'", error_type="schema_validation", line_number=None))
-                        if strict:
-                            block_errors = True
+                visited.add(n)
+                order.append(n)
+                for child in self._id_graph_rev.get(n, set()):
+                    if child in sub_indeg:
+                        sub_indeg[child] = max(0, sub_indeg.get(child, 1) - 1)
+                        if sub_indeg.get(child, 0) == 0:
+                            queue2.append(child)
+            # If any impacted node still has indegree > 0 within subset, cycles exist; fall back to full reload
+            if any(d > 0 for d in sub_indeg.values()):
+                return self.ensure_loaded(force=True, reason=reason)
 
-            model_input = {
-                "id": merged.get("id"),
-                "assistant": merged.get("assistant"),
-                "category": merged.get("category"),
-                "operators": merged.get("operators", []),
-                "hparams": merged.get("hparams", {}),
-                "guards": merged.get("guards", {}),
-                "examples": merged.get("examples", []),
-            }
-            # id prefix consistency (same as ensure_loaded)
-            id_val = model_input.get("id")
-            asst = model_input.get("assistant")
-            cat = model_input.get("category")
-            if isinstance(id_val, str) and id_val.count(".") >= 2:
-                parts = id_val.split(".")
-                known_assistants = {"chatgpt", "claude", "gemini", "deepseek"}
-                known_categories = {"coding", "science", "psychology", "law", "politics"}
-                if parts[0] in known_assistants and parts[1] in known_categories:
-                    if parts[0] != asst or parts[1] != cat:
-                        errors.append(RecipeError(file_path=file_path, error=f"assistant/category fields must match id prefix: {id_val}", error_type="semantic_validation", line_number=None))
-                        if strict:
-                            block_errors = True
-            # extends assistant/category compatibility
-            for parent in self._id_graph.get(rid, []):
-                pfile = self._id_to_file.get(parent)
-                if pfile and parent in compiled_by_id:
-                    p = compiled_by_id[parent]
-                    pa, pc = p.get("assistant"), p.get("category")
-                    if pa and pc and (pa != asst or pc != cat):
-                        errors.append(RecipeError(file_path=file_path, error=f"extends parent '{parent}' assistant/category mismatch", error_type="cross_file_validation", line_number=None))
+            # Helper to read fragment (same as in ensure_loaded)
+            def read_fragment(rel: str, ref_file: str) -> Optional[Dict[str, Any]]:
+                abs_path = (Path(self.recipes_dir) / rel)
+                if not abs_path.exists():
+                    errors.append(RecipeError(file_path=ref_file, error=f"include not found: {rel}", error_type="cross_file_validation", line_number=None))
+                    return None
+                frag_data, perr, _ = self._parse_cached(str(abs_path))
+                if perr is not None:
+                    errors.append(perr)
+                    return None
+                if not isinstance(frag_data, dict):
+                    errors.append(RecipeError(file_path=str(abs_path), error="fragment YAML root must be a mapping", error_type="schema_validation", line_number=None))
+                    return None
+                if not self._validate_fragment_schema(frag_data, str(abs_path), ref_file, errors):
+                    return None
+                return frag_data
+
+            # Start from current compiled snapshot and update impacted ones
+            compiled_by_id = dict(self._compiled_by_id)
+            last_known_good = self._last_known_good_by_id
+
+            # Recompile in order
+            for rid in order:
+                file_path = self._id_to_file.get(rid)
+                if not file_path:
+                    # Should not happen for known ids
+                    continue
+                raw = self._raw_docs_by_file.get(file_path, {})
+                merged: Dict[str, Any] = {}
+                block_errors = False
+                # parents
+                for parent in self._id_graph.get(rid, []):
+                    if parent in compiled_by_id:
+                        merged = self._deep_merge(merged, compiled_by_id[parent])
+                    else:
+                        errors.append(RecipeError(file_path=file_path, error=f"missing parent id '{parent}'", error_type="cross_file_validation", line_number=None))
                         if strict:
                             block_errors = True
-            # Optional JSON Schema validation prior to Pydantic
-            if not self._validate_with_jsonschema(model_input, file_path, strict, errors):
-                if strict:
-                    block_errors = True
-            try:
-                model = RecipeModel(**model_input)
-            except ValidationError as e:
-                errors.append(RecipeError(file_path=file_path, error=str(e), error_type="schema_validation", line_number=None))
-                continue
-            # examples file refs validation (same as ensure_loaded)
-            for ex in list(model.examples or []):
-                if isinstance(ex, str) and ("/" in ex or ex.startswith("./") or ex.endswith((".txt", ".md", ".yaml", ".yml"))):
-                    abs_ex = (Path(self.recipes_dir) / ex).resolve()
-                    try:
-                        abs_ex.relative_to(Path(self.recipes_dir).resolve())
-                    except Exception:
-                        errors.append(RecipeError(file_path=file_path, error=f"examples reference escapes recipes/: {ex}", error_type="cross_file_validation", line_number=None))
+                # includes
+                for rel in self._includes_by_file.get(file_path, []):
+                    frag = read_fragment(rel, file_path)
+                    if frag is None:
                         if strict:
                             block_errors = True
                         continue
-                    if not abs_ex.exists():
-                        errors.append(RecipeError(file_path=file_path, error=f"examples reference not found: {ex}", error_type="cross_file_validation", line_number=None))
-                        if strict:
-                            block_errors = True
-            # semantics
-            for msg in validate_recipe(model):
-                errors.append(RecipeError(file_path=file_path, error=msg, error_type="semantic_validation", line_number=None))
-                if strict:
-                    block_errors = True
-
-            if block_errors:
-                # Keep last-known-good if available and not strict; in strict mode it's excluded from models
-                if not strict and rid in last_known_good:
-                    compiled_by_id[rid] = last_known_good[rid]
-                # else leave compiled_by_id as-is (might keep old compiled or none)
-                continue
-            else:
-                compiled_by_id[rid] = model_input
-                last_known_good[rid] = model_input
-
-        # Update compiled state
-        self._compiled_by_id = compiled_by_id
-        # Update models list by replacing impacted ids
-        id_to_model: Dict[str, RecipeModel] = {m.id: m for m in self._recipes}
-        for rid in impacted_ids:
-            data = self._compiled_by_id.get(rid)
-            if not data:
-                continue
-            try:
-                id_to_model[rid] = RecipeModel(**data)
-            except Exception:
-                pass
-        # Rebuild recipes list preserving original order; append any new ids at end
-        old_order = [m.id for m in self._recipes]
-        new_list: List[RecipeModel] = []
-        seen_ids: Set[str] = set()
-        for rid in old_order:
-            if rid in id_to_model:
-                new_list.append(id_to_model[rid])
-                seen_ids.add(rid)
-        for rid, data in self._compiled_by_id.items():
-            if rid not in seen_ids:
+                    merged = self._deep_merge(merged, frag)
+                # self
+                merged = self._deep_merge(merged, {k: v for k, v in raw.items() if k not in ("include", "extends")})
+                self._apply_operators_plus(merged)
+                merged = self._apply_env_substitution(merged, file_path=file_path, rid=rid, strict=strict, collect_errors=errors)
+                # operator whitelist validation
+                allowed_ops = {"role_hdr", "constraints", "io_format", "examples", "quality_bar"}
+                ops_val = merged.get("operators", [])
+                if isinstance(ops_val, list):
+                    for op in ops_val:
+                        if not isinstance(op, str) or op not in allowed_ops:
+                            errors.append(RecipeError(file_path=file_path, error=f"unknown operator '{op}'", error_type="schema_validation", line_number=None))
+                            if strict:
+                                block_errors = True
+
+                model_input = {
+                    "id": merged.get("id"),
+                    "assistant": merged.get("assistant"),
+                    "category": merged.get("category"),
+                    "operators": merged.get("operators", []),
+                    "hparams": merged.get("hparams", {}),
+                    "guards": merged.get("guards", {}),
+                    "examples": merged.get("examples", []),
+                }
+                # id prefix consistency (same as ensure_loaded)
+                id_val = model_input.get("id")
+                asst = model_input.get("assistant")
+                cat = model_input.get("category")
+                if isinstance(id_val, str) and id_val.count(".") >= 2:
+                    parts = id_val.split(".")
+                    known_assistants = {"chatgpt", "claude", "gemini", "deepseek"}
+                    known_categories = {"coding", "science", "psychology", "law", "politics"}
+                    if parts[0] in known_assistants and parts[1] in known_categories:
+                        if parts[0] != asst or parts[1] != cat:
+                            errors.append(RecipeError(file_path=file_path, error=f"assistant/category fields must match id prefix: {id_val}", error_type="semantic_validation", line_number=None))
+                            if strict:
+                                block_errors = True
+                # extends assistant/category compatibility
+                for parent in self._id_graph.get(rid, []):
+                    pfile = self._id_to_file.get(parent)
+                    if pfile and parent in compiled_by_id:
+                        p = compiled_by_id[parent]
+                        pa, pc = p.get("assistant"), p.get("category")
+                        if pa and pc and (pa != asst or pc != cat):
+                            errors.append(RecipeError(file_path=file_path, error=f"extends parent '{parent}' assistant/category mismatch", error_type="cross_file_validation", line_number=None))
+                            if strict:
+                                block_errors = True
+                # Optional JSON Schema validation prior to Pydantic
+                if not self._validate_with_jsonschema(model_input, file_path, strict, errors):
+                    if strict:
+                        block_errors = True
                 try:
-                    new_list.append(RecipeModel(**data))
-                    seen_ids.add(rid)
+                    model = RecipeModel(**model_input)
+                except ValidationError as e:
+                    errors.append(RecipeError(file_path=file_path, error=str(e), error_type="schema_validation", line_number=None))
+                    continue
+                # examples file refs validation (same as ensure_loaded)
+                for ex in list(model.examples or []):
+                    if isinstance(ex, str) and ("/" in ex or ex.startswith("./") or ex.endswith((".txt", ".md", ".yaml", ".yml"))):
+                        abs_ex = (Path(self.recipes_dir) / ex).resolve()
+                        try:
+                            abs_ex.relative_to(Path(self.recipes_dir).resolve())
+                        except Exception:
+                            errors.append(RecipeError(file_path=file_path, error=f"examples reference escapes recipes/: {ex}", error_type="cross_file_validation", line_number=None))
+                            if strict:
+                                block_errors = True
+                            continue
+                        if not abs_ex.exists():
+                            errors.append(RecipeError(file_path=file_path, error=f"examples reference not found: {ex}", error_type="cross_file_validation", line_number=None))
+                            if strict:
+                                block_errors = True
+                # semantics
+                for msg in validate_recipe(model):
+                    errors.append(RecipeError(file_path=file_path, error=msg, error_type="semantic_validation", line_number=None))
+                    if strict:
+                        block_errors = True
+
+                if block_errors:
+                    # Keep last-known-good if available and not strict; in strict mode it's excluded from models
+                    if not strict and rid in last_known_good:
+                        compiled_by_id[rid] = last_known_good[rid]
+                    # else leave compiled_by_id as-is (might keep old compiled or none)
+                    continue
+                else:
+                    compiled_by_id[rid] = model_input
+                    last_known_good[rid] = model_input
+
+            # Update compiled state
+            self._compiled_by_id = compiled_by_id
+            # Update models list by replacing impacted ids
+            id_to_model: Dict[str, RecipeModel] = {m.id: m for m in self._recipes}
+            for rid in impacted_ids:
+                data = self._compiled_by_id.get(rid)
+                if not data:
+                    continue
+                try:
+                    id_to_model[rid] = RecipeModel(**data)
                 except Exception:
                     pass
-        self._recipes = new_list
+            # Rebuild recipes list preserving original order; append any new ids at end
+            old_order = [m.id for m in self._recipes]
+            new_list: List[RecipeModel] = []
+            seen_ids: Set[str] = set()
+            for rid in old_order:
+                if rid in id_to_model:
+                    new_list.append(id_to_model[rid])
+                    seen_ids.add(rid)
+            for rid, data in self._compiled_by_id.items():
+                if rid not in seen_ids:
+                    try:
+                        new_list.append(RecipeModel(**data))
+                        seen_ids.add(rid)
+                    except Exception:
+                        pass
+            self._publish(new_list)
 
-        # Update mtimes for changed fragments (best-effort; we don't track mtimes for fragments, so leave _mtimes as-is)
+            # Update mtimes for changed fragments (best-effort; we don't track mtimes for fragments, so leave _mtimes as-is)
 
-        # Recompute errors list by removing those tied to impacted files or changed fragments
-        impacted_file_set = set(impacted_recipe_files) | set(changed_fragments)
-        preserved_errors: List[RecipeError] = [e for e in self._errors if e.file_path not in impacted_file_set]
-        self._errors = preserved_errors + errors
-        self._last_loaded_ns = time.time_ns()
-        return self.snapshot()
+            # Recompute errors list by removing those tied to impacted files or changed fragments
+            impacted_file_set = set(impacted_recipe_files) | set(changed_fragments)
+            preserved_errors: List[RecipeError] = [e for e in self._errors if e.file_path not in impacted_file_set]
+            self._errors = preserved_errors + errors
+            self._last_loaded_ns = time.time_ns()
+            self._version += 1
+            return self.snapshot()
 
     def _need_reload(self) -> bool:
         files = self._scan_files()
@@ -535,14 +773,23 @@ class RecipesCache:
         wl = os.getenv("ENV_WHITELIST", "")
         if wl:
             self._env_whitelist = {s.strip() for s in wl.split(',') if s.strip()}
-        # Look for .env in repo root or recipes dir
+        # Look for .env in repo root or recipes dir; open directly instead of probing with exists()
         repo_root = Path(self.recipes_dir).parent.parent
         for cand in [repo_root / ".env", Path(self.recipes_dir) / ".env"]:
             try:
-                if cand.exists():
+                if RECIPES_ENV_USE_DOTENV:
+                    if not cand.is_file():
+                        continue
+                    # dotenv is only needed on this opt-in path, so import it lazily
+                    from dotenv import dotenv_values
+
                     vals = dotenv_values(str(cand))
                     self._env_values = {k: str(v) for k, v in vals.items() if isinstance(v, (str, int, float))}
-                    break
+                else:
+                    self._env_values = _parse_env_text(cand.read_text(encoding="utf-8"))
+                break
+            except OSError:
+                continue
             except Exception:
                 pass
         self._env_loaded = True
@@ -577,23 +824,30 @@ class RecipesCache:
     # ---------- Helpers ----------
     @staticmethod
     def _deep_merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
-        out: Dict[str, Any] = dict(base)
-        for k, v in overlay.items():
-            if isinstance(v, dict) and isinstance(out.get(k), dict):
-                out[k] = RecipesCache._deep_merge(out[k], v)
-            else:
-                out[k] = v
+        # Iterative worklist instead of recursion: no per-level call overhead or recursion limit.
+        # Nested dicts from ``base`` are copied before being written, so inputs are never mutated.
+        out: Dict[str, Any] = base.copy()
+        stack: List[Tuple[Dict[str, Any], Dict[str, Any]]] = [(out, overlay)]
+        while stack:
+            target, over = stack.pop()
+            if target.keys().isdisjoint(over):
+                # Nothing to merge at this level; a C-level update keeps the same key order
+                target.update(over)
+                continue
+            for k, v in over.items():
+                cur = target.get(k)
+                if isinstance(v, dict) and isinstance(cur, dict):
+                    child = cur.copy()
+                    target[k] = child
+                    stack.append((child, v))
+                else:
+                    target[k] = v
         return out
 
     @staticmethod
     def _dedupe_preserve_order(items: List[Any]) -> List[Any]:
-        seen: Set[Any] = set()
-        out: List[Any] = []
-        for x in items:
-            if x not in seen:
-                seen.add(x)
-                out.append(x)
-        return out
+        # dicts keep insertion order; fromkeys does the membership work in C
+        return list(dict.fromkeys(items))
 
     def _apply_operators_plus(self, merged: Dict[str, Any]) -> None:
         ops_plus = merged.pop("operators+", None)
@@ -711,8 +965,13 @@ class RecipesCache:
     def ensure_loaded(self, force: bool = False, reason: str = "auto") -> Tuple[List[RecipeModel], List[RecipeError]]:
         with self._lock:
             strict = os.getenv("VALIDATION_STRICT", "0") == "1"
-            if not force and not self._need_reload():
-                return self.snapshot()
+            if not force:
+                now_ns = time.monotonic_ns()
+                if self._last_loaded_ns and now_ns < self._next_check_ns:
+                    return self.snapshot()
+                self._next_check_ns = now_ns + self._check_ttl_ns
+                if not self._need_reload():
+                    return self.snapshot()
             files = self._scan_files()
             errors: List[RecipeError] = []
             mtimes: Dict[str, int] = {}
@@ -722,12 +981,16 @@ class RecipesCache:
             id_to_file: Dict[str, str] = {}
             duplicates: Dict[str, List[str]] = {}
 
+            # Drop cached parses for files that disappeared since the last load
+            live = set(files)
+            frags_prefix = os.path.join(self.recipes_dir, "_fragments") + os.sep
+            for cached_path in list(self._parse_cache):
+                if cached_path not in live and not cached_path.startswith(frags_prefix):
+                    del self._parse_cache[cached_path]
+
+            self._prime_parse_cache(files)
             for path in files:
-                data, perr = _parse_yaml(path)
-                try:
-                    mtimes[path] = os.stat(path).st_mtime_ns
-                except FileNotFoundError:
-                    mtimes[path] = 0
+                data, perr, mtimes[path] = self._parse_cached(path)
                 if perr is not None:
                     errors.append(perr)
                     continue
@@ -847,7 +1110,7 @@ class RecipesCache:
                 if not abs_path.exists():
                     errors.append(RecipeError(file_path=ref_file, error=f"include not found: {rel}", error_type="cross_file_validation", line_number=None))
                     return None
-                frag_data, perr = _parse_yaml(str(abs_path))
+                frag_data, perr, _ = self._parse_cached(str(abs_path))
                 if perr is not None:
                     errors.append(perr)
                     return None
@@ -977,7 +1240,7 @@ class RecipesCache:
 
             # Swap state
             if out_models:
-                self._recipes = out_models
+                self._publish(out_models)
                 self._mtimes = mtimes
                 self._raw_docs_by_file = raw_docs
                 self._defines_by_file = defines_by_file
@@ -988,6 +1251,7 @@ class RecipesCache:
                 self._compiled_by_id = compiled_by_id
             self._errors = errors
             self._last_loaded_ns = time.time_ns()
+            self._version += 1
             return self.snapshot()
 
 
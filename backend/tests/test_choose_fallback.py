@@ -42,3 +42,43 @@ def test_choose_returns_503_when_all_invalid(tmp_path, monkeypatch):
     assert r.status_code == 503, r.text
     body = r.json()
     assert body['detail']['code'] == 'recipes_unavailable'
+
+
+def test_choose_returns_404_when_no_recipes(tmp_path, monkeypatch):
+    import backend.app.main as main_mod
+    from backend.app.recipes import RecipesCache
+
+    # Empty directory: nothing invalid, just nothing to choose from
+    monkeypatch.setattr(main_mod.app.state, 'recipes_cache', RecipesCache(str(tmp_path)))
+    client = TestClient(main_mod.app)
+
+    r = client.post('/choose', json={
+        'assistant': 'chatgpt',
+        'category': 'coding',
+        'raw_input': 'test'
+    })
+    assert r.status_code == 404, r.text
+    assert r.json()['detail']['code'] == 'no_recipes_available'
+
+
+def test_choose_notes_have_single_enhanced_entry(monkeypatch):
+    import backend.app.main as main_mod
+    from backend.app.recipes import RecipesCache
+
+    class _Echo:
+        def enhance(self, text, assistant, category):
+            return text
+
+    # Earlier tests may leave a broken cache on app.state; use the real recipes directory
+    monkeypatch.setattr(main_mod.app.state, 'recipes_cache', RecipesCache(main_mod.RECIPES_DIR))
+    client = TestClient(main_mod.app)
+    payload = {'assistant': 'chatgpt', 'category': 'coding', 'raw_input': 'test'}
+    r = client.post('/choose', json=payload)
+    assert r.status_code == 200, r.text
+    assert [n for n in r.json()['notes'] if n.startswith('enhanced=')] == ['enhanced=false']
+
+    monkeypatch.setattr(main_mod, 'ENHANCER_ENABLED', True)
+    monkeypatch.setattr(main_mod.app.state, 'enhancer', _Echo(), raising=False)
+    r = client.post('/choose', json={**payload, 'options': {'enhance': True}})
+    assert r.status_code == 200, r.text
+    assert [n for n in r.json()['notes'] if n.startswith('enhanced=')] == ['enhanced=true']
@@ -113,3 +113,53 @@ def test_incremental_fragment_error_then_fix_updates_errors_and_state(tmp_path):
     assert m3["chatgpt.coding.main"].hparams.get("note") == "fixed"
     # Errors list should not continue to contain a yaml_parse for this file
     assert not any(e.error_type == "yaml_parse" and e.file_path.endswith("_fragments/body.yaml") for e in errors3)
+
+
+def test_watch_coalesces_bursty_change_batches():
+    import asyncio
+    from backend.app.main import _coalesce_changes
+
+    async def batches():
+        yield {(1, "a.yaml")}
+        await asyncio.sleep(0.01)
+        yield {(2, "b.yaml"), (1, "a.yaml")}
+        await asyncio.sleep(0.3)
+        yield {(3, "c.yaml")}
+
+    async def collect():
+        return [sorted(paths) async for paths in _coalesce_changes(batches(), 0.1)]
+
+    assert asyncio.run(collect()) == [["a.yaml", "b.yaml"], ["c.yaml"]]
+
+
+def test_apply_fs_events_waits_for_load_lock(tmp_path):
+    import threading
+
+    recipes_dir = tmp_path / "recipes"
+    frag = recipes_dir / "_fragments" / "body.yaml"
+    write(frag, "hparams: { note: v1 }\n")
+    write(
+        recipes_dir / "chatgpt.coding.base.yaml",
+        """
+        id: chatgpt.coding.base
+        assistant: chatgpt
+        category: coding
+        operators: [role_hdr]
+        include: ["_fragments/body.yaml"]
+        """
+    )
+    cache = RecipesCache(str(recipes_dir))
+    cache.ensure_loaded(force=True)
+    version = cache.version
+
+    write(frag, "hparams: { note: v2 }\n")
+    done = threading.Event()
+    with cache._lock:
+        worker = threading.Thread(target=lambda: (cache.apply_fs_events([str(frag)]), done.set()))
+        worker.start()
+        # The incremental path must not touch cache state while a load holds the lock
+        assert not done.wait(0.2)
+        assert cache.version == version
+    worker.join(5)
+    assert done.is_set()
+    assert cache.version > version
@@ -39,4 +39,97 @@ def test_recipes_cache_last_known_good_and_yaml_error():
         assert len(recipes2) == 1
         assert recipes2[0].id == "test.assistant.category.baseline"
         # An error should be reported with type yaml_parse
-        assert any(e.error_type == "yaml_parse" for e in errors2), errors2
\ No newline at end of file
+        assert any(e.error_type == "yaml_parse" for e in errors2), errors2
+
+def test_recipes_cache_reparses_only_changed_files(monkeypatch):
+    import os
+    from backend.app import recipes as recipes_mod
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recipes_dir = Path(tmp)
+        for name in ("a", "b"):
+            write(
+                recipes_dir / f"{name}.yaml",
+                f"id: chatgpt.coding.{name}\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr]\n",
+            )
+
+        parsed = []
+        real_parse = recipes_mod._parse_yaml
+        monkeypatch.setattr(recipes_mod, "_parse_yaml", lambda p: parsed.append(os.path.basename(p)) or real_parse(p))
+
+        cache = RecipesCache(str(recipes_dir))
+        cache.ensure_loaded(force=True)
+        assert sorted(parsed) == ["a.yaml", "b.yaml"]
+
+        parsed.clear()
+        write(
+            recipes_dir / "b.yaml",
+            "id: chatgpt.coding.b\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr, io_format]\n",
+        )
+        recipes, _ = cache.ensure_loaded(force=True)
+        assert parsed == ["b.yaml"]
+        assert next(r for r in recipes if r.id == "chatgpt.coding.b").operators == ["role_hdr", "io_format"]
+
+
+def test_recipes_cache_index_matches_filter_scan():
+    from backend.app.recipes import filter_recipes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recipes_dir = Path(tmp)
+        for rid, asst, cat in (
+            ("chatgpt.coding.a", "chatgpt", "coding"),
+            ("chatgpt.coding.b", "chatgpt", "coding"),
+            ("claude.science.a", "claude", "science"),
+            ("claude.baseline", "claude", "politics"),
+        ):
+            write(recipes_dir / f"{rid}.yaml", f"id: {rid}\nassistant: {asst}\ncategory: {cat}\noperators: [role_hdr]\n")
+
+        cache = RecipesCache(str(recipes_dir))
+        recipes, _ = cache.ensure_loaded(force=True)
+        assert [r.id for r in cache.index.by_pair[("chatgpt", "coding")]] == ["chatgpt.coding.a", "chatgpt.coding.b"]
+        for asst, cat in (
+            ("chatgpt", "coding"), ("chatgpt", "law"), ("claude", "science"), ("claude", "coding"),
+            ("gemini", "science"), ("gemini", "law"),
+        ):
+            hot, tier, notes = filter_recipes(recipes, asst, cat, index=cache.index)
+            assert cache.get_filtered(asst, cat) == (hot, tier, notes)
+            scanned, scan_tier, scan_notes = filter_recipes(recipes, asst, cat)
+            assert (tier, notes) == (scan_tier, scan_notes)
+            assert [(h.id, h.operators, h.is_baseline) for h in hot] == [
+                (r.id, tuple(r.operators), r.id.endswith(".baseline")) for r in scanned
+            ]
+
+
+def test_recipes_cache_check_ttl_defers_mtime_checks():
+    with tempfile.TemporaryDirectory() as tmp:
+        recipes_dir = Path(tmp)
+        f = recipes_dir / "a.yaml"
+        write(f, "id: chatgpt.coding.a\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr]\n")
+
+        cache = RecipesCache(str(recipes_dir), check_ttl_seconds=60)
+        cache.ensure_loaded()
+        write(f, "id: chatgpt.coding.a\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr, io_format]\n")
+
+        version = cache.version
+        recipes, _ = cache.ensure_loaded()
+        assert recipes[0].operators == ["role_hdr"]
+        assert cache.version == version
+        recipes, _ = cache.ensure_loaded(force=True)
+        assert recipes[0].operators == ["role_hdr", "io_format"]
+        assert cache.version > version
+
+
+def test_recipes_cache_get_filtered_memo_resets_on_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        recipes_dir = Path(tmp)
+        write(recipes_dir / "a.yaml", "id: chatgpt.coding.a\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr]\n")
+        cache = RecipesCache(str(recipes_dir))
+        cache.ensure_loaded(force=True)
+
+        first = cache.get_filtered("chatgpt", "coding")
+        assert cache.get_filtered("chatgpt", "coding") is first
+        assert [r.id for r in first[0]] == ["chatgpt.coding.a"]
+
+        write(recipes_dir / "b.yaml", "id: chatgpt.coding.b\nassistant: chatgpt\ncategory: coding\noperators: [role_hdr]\n")
+        cache.ensure_loaded(force=True)
+        assert [r.id for r in cache.get_filtered("chatgpt", "coding")[0]] == ["chatgpt.coding.a", "chatgpt.coding.b"]
@@ -58,3 +58,28 @@ def test_env_missing_var_warns(tmp_path, monkeypatch):
     # Should still compile in non-strict mode but produce a semantic_validation warning
     assert any(r.id == "chatgpt.coding.missing" for r in recipes)
     assert any(e.error_type == "semantic_validation" and "MISSING_VAR" in e.error for e in errors)
+
+
+def test_env_file_values_used_when_process_env_unset(tmp_path, monkeypatch):
+    recipes_dir = tmp_path / "recipes"
+    recipes_dir.mkdir()
+    # RecipesCache looks two levels above the recipes dir for the repo-root .env
+    (recipes_dir / ".env").write_text("# comment\nexport ORG_NAME=\"FromEnvFile\"\n", encoding="utf-8")
+
+    monkeypatch.setenv("ENV_WHITELIST", "ORG_NAME")
+    monkeypatch.delenv("ORG_NAME", raising=False)
+
+    write(recipes_dir / "chatgpt.coding.envfile.yaml", """
+    id: chatgpt.coding.envfile
+    assistant: chatgpt
+    category: coding
+    operators: [role_hdr]
+    hparams:
+      model_note: "Org=${ORG_NAME}"
+    """)
+
+    cache = RecipesCache(str(recipes_dir))
+    recipes, errors = cache.ensure_loaded(force=True)
+
+    r = next(r for r in recipes if r.id == "chatgpt.coding.envfile")
+    assert r.hparams.get("model_note") == "Org=FromEnvFile"
@@ -1,7 +1,7 @@
 import random
 from typing import List
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from backend.app.bandit import BanditService, BanditConfig
@@ -69,4 +69,39 @@ def test_service_exploit_after_initial_samples():
     db.flush()
     row = db.query(BanditStats).filter(BanditStats.assistant == "chatgpt", BanditStats.category == "coding", BanditStats.recipe_id == "best").first()
     assert row is not None
-    assert int(row.exploit_count or 0) >= 1
\ No newline at end of file
+    assert int(row.exploit_count or 0) >= 1
+
+def test_repository_set_feedback_totals_overwrites_and_creates():
+    from backend.app.bandit import BanditStatsRepository
+
+    db = make_session()
+    repo = BanditStatsRepository()
+    repo.increment_selection(db, "chatgpt", "coding", "r1", explored=True)
+    repo.upsert_feedback(db, "chatgpt", "coding", "r1", 0.5)
+    repo.set_feedback_totals(db, [
+        {"assistant": "chatgpt", "category": "coding", "recipe_id": "r1", "sample_count": 4, "reward_sum": 3.0},
+        {"assistant": "chatgpt", "category": "coding", "recipe_id": "r2", "sample_count": 2, "reward_sum": 1.5},
+    ])
+    db.commit()
+
+    stats = repo.get_group_stats(db, "chatgpt", "coding")
+    assert stats["r1"] == {"sample_count": 4.0, "reward_sum": 3.0, "explore_count": 1.0, "exploit_count": 0.0}
+    assert stats["r2"] == {"sample_count": 2.0, "reward_sum": 1.5, "explore_count": 0.0, "exploit_count": 0.0}
+
+
+def test_repository_set_feedback_totals_fits_old_sqlite_parameter_limit():
+    from backend.app.bandit import BanditStatsRepository
+
+    db = make_session()
+    bound: List[int] = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda conn, cur, stmt, params, ctx, many: bound.append(len(params)))
+    rows = [
+        {"assistant": "chatgpt", "category": "coding", "recipe_id": f"r{i}", "sample_count": 1, "reward_sum": 0.5}
+        for i in range(300)
+    ]
+    BanditStatsRepository().set_feedback_totals(db, rows)
+    db.commit()
+
+    # SQLite < 3.32 rejects statements with more than 999 bound parameters
+    assert bound and max(bound) <= 999
+    assert db.query(BanditStats).count() == 300
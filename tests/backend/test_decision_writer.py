@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import Base, Decision
+from backend.app.decision_writer import DecisionWriter
+
+
+def mk_row(i: int, **extra) -> dict:
+    row = {
+        "id": f"d{i}",
+        "assistant": "chatgpt",
+        "category": "coding",
+        "recipe_id": "r1",
+        "propensity": 1.0,
+        "context": {"input_tokens": i},
+        "hparams": {},
+        "operators": ["role_hdr"],
+    }
+    row.update(extra)
+    return row
+
+
+def test_writer_batches_rows_into_few_commits(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'w.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    Session = sessionmaker(bind=engine)
+
+    writer = DecisionWriter(session_factory=Session, batch_max=64, batch_ms=50)
+    for i in range(20):
+        # Mixed column sets: only some rows carry stored text
+        writer.submit(mk_row(i, raw_input="x") if i % 2 else mk_row(i))
+    writer.flush()
+
+    db = Session()
+    rows = db.query(Decision).order_by(Decision.id).all()
+    assert len(rows) == 20
+    assert all(r.ts is not None for r in rows)
+    assert db.get(Decision, "d1").raw_input == "x"
+    assert db.get(Decision, "d2").raw_input is None
+    # One commit per drained batch rather than one per row
+    assert 1 <= len(commits) < 20
+
+
+def test_flush_without_submissions_returns_immediately():
+    writer = DecisionWriter()
+    writer.flush()
+
+
+def test_flush_waits_only_for_rows_submitted_before_the_call():
+    writer = DecisionWriter(batch_max=1, batch_ms=0)
+    first_released = threading.Event()
+    later_released = threading.Event()
+
+    def fake_write(rows):
+        if rows[0]["id"] == "d0":
+            first_released.wait(5)
+            # Traffic keeps arriving while the flush is pending
+            writer.submit(mk_row(1))
+        else:
+            later_released.wait(5)
+
+    writer._write = fake_write  # type: ignore[method-assign]
+    writer.submit(mk_row(0))
+    flushed = threading.Event()
+    flusher = threading.Thread(target=lambda: (writer.flush(), flushed.set()))
+    flusher.start()
+    time.sleep(0.05)
+    first_released.set()
+
+    # d1 is still stuck, but it was submitted after flush() took its watermark
+    assert flushed.wait(2)
+    later_released.set()
+    writer.close()
+    flusher.join()
+
+
+def test_close_persists_queued_rows_and_stops_thread(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'w.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    writer = DecisionWriter(session_factory=Session, batch_max=8, batch_ms=20)
+
+    for i in range(5):
+        writer.submit(mk_row(i))
+    thread = writer._thread
+    writer.close()
+
+    assert Session().query(Decision).count() == 5
+    assert thread is not None and not thread.is_alive()
+    # A later submit starts a fresh writer
+    writer.submit(mk_row(9))
+    writer.flush()
+    assert Session().get(Decision, "d9") is not None
+    writer.close()
+
+
+def test_writer_thread_shares_in_memory_database():
+    import subprocess
+    import sys
+    import textwrap
+
+    # db.py reads DATABASE_URL at import time, so exercise it in a fresh interpreter
+    script = textwrap.dedent(
+        """
+        from backend.app.db import SessionLocal, Decision, init_db
+        from backend.app.decision_writer import DecisionWriter
+
+        init_db()
+        writer = DecisionWriter()
+        writer.submit({"id": "d0", "assistant": "chatgpt", "category": "coding", "recipe_id": "r1",
+                       "propensity": 1.0, "context": {}, "hparams": {}, "operators": []})
+        writer.close()
+        assert SessionLocal().get(Decision, "d0") is not None
+        """
+    )
+    root = Path(__file__).resolve().parents[2]
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
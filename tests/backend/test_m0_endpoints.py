@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 import json
+import uuid
 from fastapi.testclient import TestClient
 
 # Ensure app imports find the backend package
@@ -51,4 +52,74 @@ def test_cors_env_policy(monkeypatch):
         "Access-Control-Request-Method": "GET"
     })
     # CORS middleware should include AC-Allow-Origin header when wildcard
-    assert r.headers.get("access-control-allow-origin") in ("*", "http://example.com")
\ No newline at end of file
+    assert r.headers.get("access-control-allow-origin") in ("*", "http://example.com")
+
+def test_history_includes_feedback_reward():
+    client = TestClient(app)
+    r = client.post("/choose", json={"assistant": "chatgpt", "category": "coding", "raw_input": "history check"})
+    assert r.status_code == 200, r.text
+    decision_id = r.json()["decision_id"]
+    assert uuid.UUID(decision_id).version == 7  # time-ordered ids
+    r = client.post("/feedback", json={"decision_id": decision_id, "reward": 0.7, "reward_components": {"user_like": 0.7}})
+    assert r.status_code == 200, r.text
+
+    r = client.get("/history", params={"assistant": "chatgpt", "category": "coding", "limit": 200})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["total"] >= 1
+    item = next(i for i in data["items"] if i["id"] == decision_id)
+    assert item["reward"] == 0.7
+    assert item["raw_input"] is None
+
+
+def test_stats_cache_invalidated_by_feedback():
+    client = TestClient(app)
+    chosen = client.post("/choose", json={"assistant": "chatgpt", "category": "coding", "raw_input": "stats check"})
+    assert chosen.status_code == 200, chosen.text
+    recipe_id = chosen.json()["recipe_id"]
+
+    def count() -> int:
+        r = client.get("/stats", params={"assistant": "chatgpt", "category": "coding"})
+        assert r.status_code == 200, r.text
+        return next((i["count"] for i in r.json()["items"] if i["recipe_id"] == recipe_id), 0)
+
+    before = count()
+    assert count() == before  # served from cache
+    r = client.post("/feedback", json={"decision_id": chosen.json()["decision_id"], "reward": 0.5, "reward_components": {}})
+    assert r.status_code == 200, r.text
+    assert count() == before + 1
+
+
+def test_prompt_templates_etag_revalidation():
+    client = TestClient(app)
+    r = client.get("/prompt-templates")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert client.get("/recipes").headers["etag"] == etag
+
+    r = client.get("/prompt-templates", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    r = client.get("/prompt-templates", headers={"If-None-Match": 'W/"stale"'})
+    assert r.status_code == 200
+    assert "recipes" in r.json()
+
+
+def test_history_returns_stored_text_only_with_text():
+    client = TestClient(app)
+    r = client.post("/choose", json={
+        "assistant": "chatgpt", "category": "coding", "raw_input": "keep me",
+        "context_features": {"store_text": True},
+    })
+    assert r.status_code == 200, r.text
+    decision_id = r.json()["decision_id"]
+
+    def item(with_text: bool) -> dict:
+        r = client.get("/history", params={"limit": 200, "with_text": with_text})
+        assert r.status_code == 200, r.text
+        return next(i for i in r.json()["items"] if i["id"] == decision_id)
+
+    assert item(False)["raw_input"] is None
+    with_text = item(True)
+    assert with_text["raw_input"] == "keep me"
+    assert with_text["engineered_prompt"]
@@ -1,4 +1,6 @@
 import random
+
+import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -15,22 +17,14 @@ def make_session():
 
 
 def seed_data(db):
-    d1 = Decision(id="d1", assistant="chatgpt", category="coding", recipe_id="r1", propensity=1.0)
-    d1.set_context_dict({})
-    d1.set_hparams_dict({})
-    d1.set_operators_list(["role_hdr"])
-    d2 = Decision(id="d2", assistant="chatgpt", category="coding", recipe_id="r2", propensity=1.0)
-    d2.set_context_dict({})
-    d2.set_hparams_dict({})
-    d2.set_operators_list(["role_hdr"])
+    d1 = Decision(id="d1", assistant="chatgpt", category="coding", recipe_id="r1", propensity=1.0,
+                  context={}, hparams={}, operators=["role_hdr"])
+    d2 = Decision(id="d2", assistant="chatgpt", category="coding", recipe_id="r2", propensity=1.0,
+                  context={}, hparams={}, operators=["role_hdr"])
     db.add_all([d1, d2])
     db.commit()
-    fb1 = Feedback(decision_id="d1", reward=0.2)
-    fb1.set_components_dict({"user_like": 0.2})
-    fb1.set_safety_flags_list([])
-    fb2 = Feedback(decision_id="d2", reward=0.9)
-    fb2.set_components_dict({"user_like": 0.9})
-    fb2.set_safety_flags_list([])
+    fb1 = Feedback(decision_id="d1", reward=0.2, components={"user_like": 0.2}, safety_flags=[])
+    fb2 = Feedback(decision_id="d2", reward=0.9, components={"user_like": 0.9}, safety_flags=[])
     db.add_all([fb1, fb2])
     db.commit()
 
@@ -64,4 +58,29 @@ def test_get_optimizer_stats():
     ids = {r["recipe_id"] for r in rows}
     assert {"r1", "r2"} == ids
     means = {r["recipe_id"]: r["mean_reward"] for r in rows}
-    assert means["r2"] > means["r1"]
\ No newline at end of file
+    assert means["r2"] > means["r1"]
+
+@pytest.mark.parametrize("window_functions", [True, False])
+def test_eligible_excludes_recipes_with_three_low_recent_rewards(monkeypatch, window_functions):
+    import backend.app.optimizer as optimizer_mod
+    from backend.app.optimizer import _eligible
+
+    # Without window functions (SQLite < 3.25) the per-recipe query must still apply the rule
+    monkeypatch.setattr(optimizer_mod, "WINDOW_FUNCTIONS", window_functions)
+
+    db = make_session()
+    rewards = {"r_bad": [0.1, 0.1, 0.1], "r_ok": [0.1, 0.1, 0.9]}
+    for rid, values in rewards.items():
+        for i, value in enumerate(values):
+            d = Decision(id=f"{rid}-{i}", assistant="chatgpt", category="coding", recipe_id=rid, propensity=1.0,
+                         context={}, hparams={}, operators=[])
+            db.add(d)
+            db.commit()
+            fb = Feedback(decision_id=d.id, reward=value, components={}, safety_flags=[])
+            db.add(fb)
+            db.commit()
+    candidates = [
+        RecipeModel(id=rid, assistant="chatgpt", category="coding", operators=["role_hdr"], hparams={})
+        for rid in ("r_bad", "r_ok", "r_new")
+    ]
+    assert [r.id for r in _eligible(candidates, db)] == ["r_ok", "r_new"]